@@ -1,29 +1,41 @@
-import codecs
+import collections
 import dataclasses
+import functools
 import inspect
 import json
 import os
+import re
+import sys
 import warnings
+import weakref
 from argparse import ArgumentParser, Action
-from dataclasses import dataclass, is_dataclass
+from dataclasses import is_dataclass
 from typing import *
 
-import yaml
-
 from .utils import *
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 __all__ = [
     'ConfigValidationError', 'PatternType',
     'field_checker', 'root_checker', 'config_field', 'ConfigField',
     'config_params', 'get_config_params', 'ConfigMeta',
     'Config', 'validate_config', 'config_to_dict', 'config_defaults',
-    'ConfigLoader',
+    'ConfigLoader', 'clear_config_file_cache',
 ]
 
 # general special attributes that is recognized by ``type_info``
 
 # special attributes of a Config class
 _FIELDS = '__mltk_config_fields__'  # fields
+_FIELD_KEYSET = '__mltk_config_field_keyset__'  # frozenset of field names
+_SORTED_FIELD_KEYS = '__mltk_config_sorted_field_keys__'  # sorted field names, for repr
+_REPR_PREFIX = '__mltk_config_repr_prefix__'  # qualified name prefix, for repr
+_IMMUTABLE_DEFAULTS = '__mltk_config_immutable_defaults__'  # snapshot of immutable default values
+_DYNAMIC_DEFAULTS = '__mltk_config_dynamic_defaults__'  # fields whose default must be computed per instance
 _UNBOUND_CHECKERS = '__mltk_config_unbound_checkers__'  # unbound field and root checker params
 _PARAMS = '__mltk_config_params__'  # config parameters
 _PARAMS_CLASS_NAME = '__ConfigParams__'  # nested class as config parameters
@@ -32,22 +44,107 @@ _PARAMS_CLASS_NAME = '__ConfigParams__'  # nested class as config parameters
 _CHECKER_PARAMS = '__mltk_config_checker_params__'
 TConfig = TypeVar('TConfig')
 
+_SafeLoader = None
+"""The default YAML loader class, resolved lazily by :func:`_safe_loader`."""
+
+
+def _safe_loader():
+    # `yaml` is imported lazily, such that importing :mod:`mltk.config`
+    # does not pay the pyyaml (and potentially LibYAML) import cost for
+    # callers that never load YAML files
+    global _SafeLoader
+    if _SafeLoader is None:
+        import yaml
+        _SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return _SafeLoader
+
+_PARSED_FILE_CACHE: Dict[Tuple[str, int, int, Any], Any] = \
+    collections.OrderedDict()
+"""Parsed config files, keyed by
+``(realpath, st_mtime_ns, st_size, parser_key)``."""
+
+_PARSED_FILE_CACHE_LIMIT = 128
+"""Maximum number of parsed config files kept in the cache (LRU)."""
+
+
+def clear_config_file_cache():
+    """Clear the cache of parsed YAML/JSON config files."""
+    _PARSED_FILE_CACHE.clear()
+
+
+def _load_parsed_file(path, parse_fn, parser_key=None):
+    """
+    Parse a config file via `parse_fn`, with the parsed object cached
+    according to the file path, mtime, size and `parser_key` (which should
+    identify the loader/decoder class behind `parse_fn`, so that parsing
+    the same file with different loaders does not share cache entries).
+    A deep copy of the cached object is returned, such that the caller may
+    mutate it freely.  Set the environment variable
+    ``MLTK_CONFIG_NO_CACHE=1`` to disable the cache.
+    """
+    if os.environ.get('MLTK_CONFIG_NO_CACHE', '') == '1':
+        return parse_fn(path)
+    st = os.stat(path)
+    key = (os.path.realpath(path), st.st_mtime_ns, st.st_size, parser_key)
+    if key in _PARSED_FILE_CACHE:
+        _PARSED_FILE_CACHE.move_to_end(key)
+    else:
+        _PARSED_FILE_CACHE[key] = parse_fn(path)
+        while len(_PARSED_FILE_CACHE) > _PARSED_FILE_CACHE_LIMIT:
+            _PARSED_FILE_CACHE.popitem(last=False)
+    return deep_copy(_PARSED_FILE_CACHE[key])
+
 
 ConfigValidationError = TypeCheckError
 """Legacy name for the :class:`TypeCheckError`."""
 
 
-@dataclass
 class ObjectFieldCheckerParams(object):
-    fields: Tuple[str, ...]
-    method: classmethod
-    pre: bool
+    """Parameters of an unbound field checker."""
+
+    __slots__ = ('fields', 'method', 'pre')
+
+    def __init__(self, fields: Tuple[str, ...], method: classmethod,
+                 pre: bool):
+        self.fields = fields
+        self.method = method
+        self.pre = pre
+
+    def __repr__(self):
+        return f'ObjectFieldCheckerParams(fields={self.fields!r}, ' \
+               f'method={self.method!r}, pre={self.pre!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, ObjectFieldCheckerParams) and \
+            self.fields == other.fields and \
+            self.method == other.method and \
+            self.pre == other.pre
+
+    def __hash__(self):
+        return hash((ObjectFieldCheckerParams, self.fields, self.method,
+                     self.pre))
 
 
-@dataclass
 class ObjectRootCheckerParams(object):
-    method: classmethod
-    pre: bool
+    """Parameters of an unbound root checker."""
+
+    __slots__ = ('method', 'pre')
+
+    def __init__(self, method: classmethod, pre: bool):
+        self.method = method
+        self.pre = pre
+
+    def __repr__(self):
+        return f'ObjectRootCheckerParams(method={self.method!r}, ' \
+               f'pre={self.pre!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, ObjectRootCheckerParams) and \
+            self.method == other.method and \
+            self.pre == other.pre
+
+    def __hash__(self):
+        return hash((ObjectRootCheckerParams, self.method, self.pre))
 
 
 ObjectCheckerParams = Union[ObjectFieldCheckerParams, ObjectRootCheckerParams]
@@ -224,10 +321,23 @@ ConfigField = config_field
 """Legacy name of :func:`config_field`."""
 
 
-@dataclass
 class ConfigParams(object):
     """The parameters of a Config class."""
-    undefined_fields: bool = False
+
+    __slots__ = ('undefined_fields',)
+
+    def __init__(self, undefined_fields: bool = False):
+        self.undefined_fields = undefined_fields
+
+    def __repr__(self):
+        return f'ConfigParams(undefined_fields={self.undefined_fields!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, ConfigParams) and \
+            self.undefined_fields == other.undefined_fields
+
+    def __hash__(self):
+        return hash((ConfigParams, self.undefined_fields))
 
 
 def config_params(undefined_fields: bool = False):
@@ -290,6 +400,63 @@ def get_config_params(cls: Type[TConfig]) -> ConfigParams:
     return getattr(cls, _PARAMS)
 
 
+def _compile_config_init(cls):
+    """
+    Compile a specialized ``__init__`` for the Config class `cls` via
+    runtime code generation, hard-coding its field defaults as
+    straight-line assignments.
+
+    The generated function falls back to the generic
+    :meth:`Config.__init__` when invoked on an instance of a subclass
+    (i.e., through ``super().__init__`` from a hand-written constructor),
+    so that the subclass' own fields are still honored.
+    """
+    globalns = {
+        '_cls': cls,
+        '_params': getattr(cls, _PARAMS),
+        '_keyset': getattr(cls, _FIELD_KEYSET),
+        '_generic_init': Config.__init__,
+        '_NOT_SET': NOT_SET,
+    }
+    lines = [
+        'def __init__(self, **kwargs):',
+        '    if self.__class__ is not _cls:',
+        '        _generic_init(self, **kwargs)',
+        '        return',
+        '    d = self.__dict__',
+        '    if kwargs:',
+        '        if not _params.undefined_fields:',
+        '            for key in kwargs:',
+        '                if key not in _keyset:',
+        "                    raise ValueError(",
+        "                        f'Field {key!r} is not defined for config '",
+        "                        f'class: {_cls.__qualname__}')",
+        '        d.update(kwargs)',
+    ]
+    index = 0
+    for key, value in getattr(cls, _IMMUTABLE_DEFAULTS).items():
+        var = f'_c{index}'
+        index += 1
+        globalns[var] = value
+        lines.append(f'    if {key!r} not in d: d[{key!r}] = {var}')
+    for key, field_info in getattr(cls, _DYNAMIC_DEFAULTS):
+        var = f'_g{index}'
+        index += 1
+        globalns[var] = field_info.get_default
+        lines.append(f'    if {key!r} not in d:')
+        lines.append(f'        _v = {var}()')
+        lines.append(f'        if _v is not _NOT_SET: d[{key!r}] = _v')
+
+    namespace = {}
+    exec(compile('\n'.join(lines), f'<config init of {cls.__qualname__}>',
+                 'exec'),
+         globalns, namespace)
+    init = namespace['__init__']
+    init.__qualname__ = f'{cls.__qualname__}.__init__'
+    init.__mltk_config_generated__ = True
+    return init
+
+
 class ConfigMeta(type):
     """
     Meta class for :class:`Config`.
@@ -302,14 +469,7 @@ class ConfigMeta(type):
         # gather the compiled fields and validators from parents
         fields = {}
         unbound_checkers: List[ObjectCheckerParams] = []
-
-        def process_field_info(fi: ObjectFieldInfo):
-            # auto set the :obj:`None` default value for Optional[T]
-            if isinstance(fi.type_info, OptionalTypeInfo) and \
-                    fi.default_factory is NOT_SET and \
-                    fi.default is NOT_SET:
-                fi = fi.copy(default=None)
-            return fi
+        seen_checkers: Set[int] = set()
 
         for parent in parents:
             if not issubclass(parent, Config):
@@ -321,16 +481,25 @@ class ConfigMeta(type):
                 if key not in fields:
                     fields[key] = val
 
-            # inherit checkers
+            # inherit checkers; the checker params objects are singletons
+            # created by the decorators, so `id()` membership is enough
             for cp in getattr(parent, _UNBOUND_CHECKERS, ()):
-                if cp not in unbound_checkers:
+                cp_id = id(cp)
+                if cp_id not in seen_checkers:
+                    seen_checkers.add(cp_id)
                     unbound_checkers.append(cp)
 
         # gather the config fields defined in this class
-        annotations = dct.get('__annotations__', {})
+        annotations = dct.get('__annotations__') or {}
         cls_fields = {}
         dct_keys = list(dct)
 
+        # hoist hot global lookups into locals for the scan loop
+        _type_info = type_info
+        _type_info_from_value = type_info_from_value
+        _isfunction = inspect.isfunction
+        _ismethod = inspect.ismethod
+
         for key in dct_keys:
             val = dct[key]
 
@@ -343,20 +512,20 @@ class ConfigMeta(type):
             elif isinstance(val, type) and issubclass(val, Config):
                 cls_fields[key] = ObjectFieldInfo(
                     name=key,
-                    type_info=type_info(val),
+                    type_info=_type_info(val),
                     default_factory=val,
                 )
 
             # process the fields
             elif not isinstance(val, (property, staticmethod, type)) and \
-                    not inspect.isfunction(val) and \
-                    not inspect.ismethod(val) and \
+                    not _isfunction(val) and \
+                    not _ismethod(val) and \
                     not key.startswith('_'):
                 # compile the type info of this field
                 if key in annotations:
-                    ti = type_info(annotations[key])
+                    ti = _type_info(annotations[key])
                 elif not isinstance(val, ObjectFieldInfo):
-                    ti = type_info_from_value(val)
+                    ti = _type_info_from_value(val)
                 else:
                     ti = val.type_info
 
@@ -366,7 +535,14 @@ class ConfigMeta(type):
                 else:
                     field_info = ObjectFieldInfo(
                         name=key, type_info=ti, default=val)
-                field_info = process_field_info(field_info)
+
+                # auto set the :obj:`None` default value for Optional[T];
+                # `field_info` is freshly constructed above, so it is safe
+                # to mutate in place
+                if isinstance(field_info.type_info, OptionalTypeInfo) and \
+                        field_info.default_factory is NOT_SET and \
+                        field_info.default is NOT_SET:
+                    field_info.default = None
 
                 # add to field list
                 cls_fields[key] = field_info
@@ -375,27 +551,44 @@ class ConfigMeta(type):
                 else:
                     dct[key] = field_info.default
 
+        # process the annotation-only fields, skipping private attributes
+        # and the fields already gathered above
         for key, type_ in annotations.items():
-            # skip private attributes
-            if key.startswith('_'):
-                continue
-            # skip already processed fields
-            if key in cls_fields:
-                continue
-            # now process the field
-            ti = type_info(type_)
-            field_info = process_field_info(
-                ObjectFieldInfo(name=key, type_info=ti))
-            cls_fields[key] = field_info
+            if not key.startswith('_') and key not in cls_fields:
+                ti = _type_info(type_)
+                field_info = ObjectFieldInfo(name=key, type_info=ti)
+                if isinstance(ti, OptionalTypeInfo):
+                    field_info.default = None
+                cls_fields[key] = field_info
 
         # merge the fields and validators from parents and from this class
         fields.update(cls_fields)
-        fields = {k: fields[k] for k in fields}
         dct[_FIELDS] = fields
+        # snapshot the fields that may yield a default value, such that
+        # `Config.__init__` does not need to inspect every field.
+        # immutable default values (i.e., those whose deep copy is the
+        # object itself) are stored directly; the other defaults (factory,
+        # mutable or envvar-backed) must still be computed per instance.
+        immutable_defaults = {}
+        dynamic_defaults = []
+        for key, field_info in fields.items():
+            if field_info.envvar is None and \
+                    field_info.default is not NOT_SET and \
+                    deep_copy(field_info.default) is field_info.default:
+                immutable_defaults[key] = field_info.default
+            elif field_info.default is not NOT_SET or \
+                    field_info.default_factory is not NOT_SET or \
+                    field_info.envvar is not None:
+                dynamic_defaults.append((key, field_info))
+        dct[_IMMUTABLE_DEFAULTS] = immutable_defaults
+        dct[_DYNAMIC_DEFAULTS] = tuple(dynamic_defaults)
+        dct[_SORTED_FIELD_KEYS] = tuple(sorted(fields))
+        dct[_FIELD_KEYSET] = frozenset(fields)
         dct[_UNBOUND_CHECKERS] = unbound_checkers
 
         # construct the class
         ret_cls = super(ConfigMeta, cls).__new__(cls, name, parents, dct)
+        setattr(ret_cls, _REPR_PREFIX, ret_cls.__qualname__ + '(')
 
         # Since this class is being constructed now, the decorator
         # `config_params` has no chance to take in place, thus the
@@ -404,7 +597,7 @@ class ConfigMeta(type):
         config_params = ConfigParams()
         config_params_class = getattr(ret_cls, _PARAMS_CLASS_NAME, None)
         if config_params_class is not None:
-            for key in config_params.__dict__:
+            for key in ConfigParams.__slots__:
                 if hasattr(config_params_class, key):
                     setattr(config_params, key,
                             getattr(config_params_class, key))
@@ -441,6 +634,16 @@ class ConfigMeta(type):
         )
         setattr(ret_cls, TYPE_INFO_MAGIC_FIELD, ti)
 
+        # compile a specialized `__init__` for this class, unless this
+        # class (or an ancestor) provides a hand-written one
+        base_config = globals().get('Config')
+        if base_config is not None and '__init__' not in dct:
+            inherited_init = ret_cls.__init__
+            if inherited_init is base_config.__init__ or \
+                    getattr(inherited_init, '__mltk_config_generated__',
+                            False):
+                ret_cls.__init__ = _compile_config_init(ret_cls)
+
         # now return the class
         return ret_cls
 
@@ -516,21 +719,26 @@ class Config(metaclass=ConfigMeta):
     """
 
     def __init__(self, **kwargs):
-        params = get_config_params(self.__class__)
-        fields = getattr(self.__class__, _FIELDS)
+        cls = self.__class__
+        params = get_config_params(cls)
+
+        # copy the immutable default values in one pass; user specified
+        # values will overwrite them just below
+        self.__dict__.update(getattr(cls, _IMMUTABLE_DEFAULTS))
 
         # store user specified values
-        for key, value in kwargs.items():
-            if not params.undefined_fields and key not in fields:
-                raise ValueError(f'Field {key!r} is not defined for config '
-                                 f'class: {self.__class__.__qualname__}')
-            setattr(self, key, value)
-
-        # copy default values from the field definition to this object
-        # for unspecified fields
-        for key in fields:
+        if not params.undefined_fields:
+            keyset = getattr(cls, _FIELD_KEYSET)
+            for key in kwargs:
+                if key not in keyset:
+                    raise ValueError(f'Field {key!r} is not defined for '
+                                     f'config class: {cls.__qualname__}')
+        self.__dict__.update(kwargs)
+
+        # compute the remaining default values for unspecified fields
+        for key, field_info in getattr(cls, _DYNAMIC_DEFAULTS):
             if key not in self.__dict__:
-                default_val = fields[key].get_default()
+                default_val = field_info.get_default()
                 if default_val is not NOT_SET:
                     setattr(self, key, default_val)
 
@@ -553,24 +761,50 @@ class Config(metaclass=ConfigMeta):
         return item in self.__dict__
 
     def __eq__(self, other):
-        if not isinstance(other, self.__class__):
-            return False
-        if len(self) != len(other):
-            return False
-        for key in self:
-            if key not in other or self[key] != other[key]:
-                return False
-        return True
+        return isinstance(other, self.__class__) and \
+            self.__dict__ == other.__dict__
+
+    __hash__ = None
 
     def __repr__(self):
-        name = self.__class__.__qualname__
-        attributes = ', '.join(f'{key}={self[key]!r}' for key in sorted(self))
-        return f'{name}({attributes})'
+        cls = self.__class__
+        values = self.__dict__
+        # reuse the sorted key order computed at class creation, unless
+        # undefined fields have been added or defaults are missing
+        keys = getattr(cls, _SORTED_FIELD_KEYS)
+        if len(keys) != len(values) or \
+                not all(key in values for key in keys):
+            keys = sorted(values)
+        attributes = ', '.join(f'{key}={values[key]!r}' for key in keys)
+        prefix = getattr(cls, _REPR_PREFIX, None)
+        if prefix is None:  # pragma: no cover
+            prefix = cls.__qualname__ + '('
+        return f'{prefix}{attributes})'
 
 
 validate_config = validate_object
 """Shortcut for :func:`check_value`."""
 
+_CONFIG_OR_MAPPING = (Config, Mapping)
+_DICT_OR_CONFIG = (dict, Config)
+
+
+def _non_object_into_object_error(prefix: str, key: str) -> str:
+    return f'at {prefix + key}: cannot merge a non-object attribute ' \
+           f'into an object attribute'
+
+
+def _object_into_non_object_error(prefix: str, key: str) -> str:
+    return f'at {prefix + key}: cannot merge an object attribute ' \
+           f'into a non-object attribute'
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_key(key: str) -> Tuple[str, ...]:
+    # interned parts make the downstream dict lookups pointer-compares;
+    # the bounded cache keeps repeated loads of similar dict shapes cheap
+    return tuple(sys.intern(part) for part in key.split('.'))
+
 
 def config_to_dict(o, flatten: bool = False) -> Dict[str, Any]:
     """
@@ -591,30 +825,57 @@ def config_to_dict(o, flatten: bool = False) -> Dict[str, Any]:
     Returns:
         The casted dict.
     """
+    if not flatten:
+        # the fast paths: a shallow copy of the attribute dict for Config,
+        # and a plain field scan for dataclasses (``dataclasses.asdict``
+        # would deep-copy the whole object tree)
+        if isinstance(o, Config):
+            return dict(o.__dict__)
+        if is_dataclass(o) and not isinstance(o, type):
+            return {f.name: getattr(o, f.name)
+                    for f in dataclasses.fields(o)}
+        raise TypeError(f'`o` is neither a Config nor a dataclass object: '
+                        f'{o!r}')
+
     dct = {}
 
-    if flatten:
-        def populate_item(key, val):
-            if isinstance(val, Config) or is_dataclass(val):
-                for sub_key, sub_val in \
-                        config_to_dict(val, flatten=flatten).items():
-                    dct[f'{key}.{sub_key}'] = sub_val
-            else:
-                dct[key] = val
-    else:
-        def populate_item(key, val):
-            dct[key] = val
-
-    if isinstance(o, Config):
-        for key in o:
-            populate_item(key, o[key])
-    elif is_dataclass(o):
-        for key, val in dataclasses.asdict(o).items():
-            populate_item(key, val)
-    else:
+    def iter_items(obj):
+        # walk the object tree directly instead of dataclasses.asdict,
+        # which would deep-copy every value just to be flattened away;
+        # leaf values are therefore shallow references
+        if isinstance(obj, Config):
+            return iter(obj.__dict__.items())
+        return ((f.name, getattr(obj, f.name))
+                for f in dataclasses.fields(obj))
+
+    if not (isinstance(o, Config) or
+            (is_dataclass(o) and not isinstance(o, type))):
         raise TypeError(f'`o` is neither a Config nor a dataclass object: '
                         f'{o!r}')
 
+    # iterative depth-first traversal with a stack of item iterators,
+    # which keeps the in-order key sequence of a recursive walk without
+    # paying a Python call frame per nesting level
+    stack = []
+    prefix = ''
+    items = iter_items(o)
+    while True:
+        descended = False
+        for key, val in items:
+            if isinstance(val, Config) or \
+                    (is_dataclass(val) and not isinstance(val, type)):
+                stack.append((items, prefix))
+                prefix = f'{prefix}{key}.'
+                items = iter_items(val)
+                descended = True
+                break
+            else:
+                dct[f'{prefix}{key}'] = val
+        if not descended:
+            if not stack:
+                break
+            items, prefix = stack.pop()
+
     return dct
 
 
@@ -654,11 +915,104 @@ class LeafDict(dict):
     """
 
 
+class _ConfigAction(Action):
+
+    def __init__(self, type_info: TypeInfo, option_strings, dest,
+                 **kwargs):
+        super().__init__(option_strings, dest, **kwargs)
+        self.type_info = type_info
+
+    def __call__(self, parser, namespace, values,
+                 option_string=None):
+        try:
+            context = TypeCheckContext()
+            with context.enter(f'.{self.dest}'):
+                value = self.type_info.parse_string(values, context)
+
+        except Exception as ex:
+            message = f'Invalid value for argument `{option_string}`'
+            if str(ex):
+                message += '; ' + str(ex)
+            if not message.endswith('.'):
+                message += '.'
+            raise ValueError(message)
+        else:
+            if isinstance(value, dict):
+                value = LeafDict(value)
+            setattr(namespace, self.dest, value)
+
+
+def _get_field_help(field_info: ObjectFieldInfo) -> str:
+    config_help = field_info.description or ''
+    default_value = field_info.get_default()
+    if config_help:
+        config_help += ' '
+    if default_value is NOT_SET:
+        if field_info.required:
+            config_help += '(required'
+        else:
+            config_help += '(optional'
+    else:
+        config_help += f'(default {default_value!r}'
+    if field_info.choices:
+        config_help += f'; choices {list(field_info.choices)}'
+    config_help += ')'
+    return config_help
+
+
+def _flatten_arg_specs(ti: ObjectTypeInfo, prefix: str):
+    """Yield ``(option_string, help_msg, metavar, field_info)`` of `ti`."""
+    if prefix:
+        prefix += '.'
+    for field_name in sorted(ti.fields):
+        field_info = ti.fields[field_name]
+        if isinstance(field_info.type_info, ObjectTypeInfo):
+            yield from _flatten_arg_specs(
+                field_info.type_info, prefix + field_name)
+        else:
+            yield (f'--{prefix}{field_name}', _get_field_help(field_info),
+                   str(field_info.type_info), field_info)
+
+
+_ARG_SPECS_CACHE = weakref.WeakKeyDictionary()
+"""Flattened CLI argument specs, keyed by the Config class."""
+
+_ARG_FIELD_MAP_CACHE = weakref.WeakKeyDictionary()
+"""Flattened option-name to field-info maps, keyed by the Config class."""
+
+_FAST_CLI_ARG = re.compile(r'--([\w.]+)=(.*)', re.DOTALL)
+"""Pattern of the CLI arguments that can bypass argparse."""
+
+
+def _arg_specs_for(config_cls: type):
+    specs = _ARG_SPECS_CACHE.get(config_cls)
+    if specs is None:
+        specs = tuple(_flatten_arg_specs(type_info(config_cls), ''))
+        _ARG_SPECS_CACHE[config_cls] = specs
+    return specs
+
+
+def _arg_field_map_for(config_cls: type):
+    field_map = _ARG_FIELD_MAP_CACHE.get(config_cls)
+    if field_map is None:
+        field_map = {option_string[2:]: field_info
+                     for option_string, _, _, field_info
+                     in _arg_specs_for(config_cls)}
+        _ARG_FIELD_MAP_CACHE[config_cls] = field_map
+    return field_map
+
+
 class ConfigLoader(Generic[TConfig]):
     """
     A class to help load config attributes from multiple sources.
     """
 
+    _FILE_LOADERS = {
+        '.yml': 'load_yaml',
+        '.yaml': 'load_yaml',
+        '.json': 'load_json',
+    }  # file extension -> loader method name, used by :meth:`load_file`
+
     def __init__(self, config_or_cls: Union[Type[TConfig], TConfig]):
         """
         Construct a new :class:`ConfigLoader`.
@@ -680,6 +1034,7 @@ class ConfigLoader(Generic[TConfig]):
         self._config_cls = config_cls
         self._config_type_info = type_info(config_cls)
         self._config = config
+        self._cached_parser = None  # type: Optional[ArgumentParser]
 
     @property
     def config_cls(self) -> Type[TConfig]:
@@ -748,64 +1103,85 @@ class ConfigLoader(Generic[TConfig]):
             raise TypeError(f'`key_values` must be a dict or a Config object: '
                             f'got {key_values!r}')
 
-        def copy_values(src, dst, prefix):
-            for key in src:
-                err_msg1 = lambda: (
-                    f'at {prefix + key}: cannot merge a non-object '
-                    f'attribute into an object attribute')
-                err_msg2 = lambda: (
-                    f'at {prefix + key}: cannot merge an object '
-                    f'attribute into a non-object attribute')
+        def copy_values(src, dst, prefix,
+                        # bind hot globals as locals via default arguments
+                        _Config=Config, _LeafDict=LeafDict,
+                        _dict_or_config=_DICT_OR_CONFIG, _NOT_SET=NOT_SET):
+            # cache of already-resolved intermediate nodes, keyed by the
+            # dotted parent path relative to `dst`
+            node_cache = {}
 
+            for key in src:
                 # find the target node in dst
-                parts = key.split('.')
-                tmp = dst
-                for part in parts[:-1]:
-                    if part not in tmp:
-                        tmp[part] = Config()
-                    elif not isinstance(tmp[part], Config):
-                        raise ValueError(err_msg2())
-                    tmp = tmp[part]
+                parts = _split_key(key)
+                part = parts[-1]
+                parent = parts[:-1]
+                if not parent:
+                    tmp = dst
+                else:
+                    tmp = node_cache.get(parent, _NOT_SET)
+                    if tmp is _NOT_SET:
+                        tmp = dst
+                        for p in parent:
+                            p_val = tmp.__dict__.get(p, _NOT_SET)
+                            if p_val is _NOT_SET:
+                                p_val = _Config()
+                                tmp.__dict__[p] = p_val
+                            elif not isinstance(p_val, _Config):
+                                raise ValueError(
+                                    _object_into_non_object_error(
+                                        prefix, key))
+                            tmp = p_val
+                        node_cache[parent] = tmp
 
                 # get the src and dst values
-                part = parts[-1]
                 src_val = src[key]
-                try:
-                    dst_val = getattr(tmp, part)
-                except AttributeError:
-                    dst_val = NOT_SET
+                dst_val = tmp.__dict__.get(part, _NOT_SET)
 
                 # now copy the values to the target node
-                if isinstance(src_val, LeafDict):
+                if isinstance(src_val, _LeafDict):
                     new_val = src_val
-                elif isinstance(src_val, (dict, Config)):
-                    if dst_val is NOT_SET:
+                elif isinstance(src_val, _dict_or_config):
+                    if dst_val is _NOT_SET:
                         new_val = copy_values(
-                            src_val, Config(), prefix=prefix + key + '.')
-                    elif isinstance(dst_val, Config):
+                            src_val, _Config(), prefix=prefix + key + '.')
+                    elif isinstance(dst_val, _Config):
                         new_val = copy_values(
                             src_val, dst_val, prefix=prefix + key + '.')
                     else:
-                        raise ValueError(err_msg2())
+                        raise ValueError(
+                            _object_into_non_object_error(prefix, key))
                 else:
-                    if isinstance(dst_val, Config):
-                        raise ValueError(err_msg1())
+                    if isinstance(dst_val, _Config):
+                        raise ValueError(
+                            _non_object_into_object_error(prefix, key))
                     else:
                         new_val = src_val
 
-                tmp[part] = new_val
+                tmp.__dict__[part] = new_val
+
+                # an object node replaced by a leaf value makes any cached
+                # node under it stale
+                if new_val is not dst_val and isinstance(dst_val, _Config) \
+                        and node_cache:
+                    n = len(parts)
+                    for k in [k for k in node_cache if k[:n] == parts]:
+                        del node_cache[k]
 
             return dst
 
         def update_config(config, source):
+            # Config defines no custom __setattr__ or descriptors for its
+            # fields, so going through __dict__ directly is safe
+            d = config.__dict__
             for key in source:
                 val = source[key]
-                self_val = getattr(config, key, None)
+                self_val = d.get(key)
                 if isinstance(self_val, Config) and \
-                        isinstance(val, (Config, Mapping)):
+                        isinstance(val, _CONFIG_OR_MAPPING):
                     update_config(self_val, val)
                 else:
-                    setattr(config, key, val)
+                    d[key] = val
 
         update_config(
             self._config,
@@ -820,23 +1196,39 @@ class ConfigLoader(Generic[TConfig]):
             path: Path of the JSON file.
             cls: The JSON decoder class.
         """
-        with codecs.open(path, 'rb', 'utf-8') as f:
-            obj = json.load(f, cls=cls)
-            self.load_object(obj)
+        def parse_fn(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            if cls is None and orjson is not None:
+                return orjson.loads(data)
+            return json.loads(data, cls=cls)
+
+        obj = _load_parsed_file(path, parse_fn, parser_key=cls)
+        self.load_object(obj)
 
     def load_yaml(self, path: Union[str, bytes, os.PathLike],
-                  Loader=yaml.SafeLoader):
+                  Loader=None):
         """
         Load config from a YAML file.
 
         Args:
             path: Path of the YAML file.
-            Loader: The YAML loader class.
+            Loader: The YAML loader class.  Defaults to ``yaml.CSafeLoader``
+                if the LibYAML bindings are installed, or ``yaml.SafeLoader``
+                otherwise.
         """
-        with codecs.open(path, 'rb', 'utf-8') as f:
-            obj = yaml.load(f, Loader=Loader)
-            if obj is not None:
-                self.load_object(obj)
+        import yaml
+
+        if Loader is None:
+            Loader = _safe_loader()
+
+        def parse_fn(path):
+            with open(path, 'rb') as f:
+                return yaml.load(f.read(), Loader=Loader)
+
+        obj = _load_parsed_file(path, parse_fn, parser_key=Loader)
+        if obj is not None:
+            self.load_object(obj)
 
     def load_file(self, path: Union[str, bytes, os.PathLike]):
         """
@@ -850,14 +1242,11 @@ class ConfigLoader(Generic[TConfig]):
         Args:
             path: Path of the file.
         """
-        name, ext = os.path.splitext(path)
-        ext = ext.lower()
-        if ext in ('.yml', '.yaml'):
-            self.load_yaml(path)
-        elif ext in ('.json',):
-            self.load_json(path)
-        else:
+        ext = os.path.splitext(path)[1].lower()
+        method_name = self._FILE_LOADERS.get(ext)
+        if method_name is None:
             raise IOError(f'Unsupported config file extension: {ext}')
+        getattr(self, method_name)(path)
 
     def build_arg_parser(self, parser: Optional[ArgumentParser] = None
                          ) -> ArgumentParser:
@@ -875,71 +1264,25 @@ class ConfigLoader(Generic[TConfig]):
         Returns:
             The argument parser.
         """
-        class _ConfigAction(Action):
-
-            def __init__(self, type_info: TypeInfo, option_strings, dest,
-                         **kwargs):
-                super().__init__(option_strings, dest, **kwargs)
-                self.type_info = type_info
-
-            def __call__(self, parser, namespace, values,
-                         option_string=None):
-                try:
-                    context = TypeCheckContext()
-                    with context.enter(f'.{self.dest}'):
-                        value = self.type_info.parse_string(values, context)
-
-                except Exception as ex:
-                    message = f'Invalid value for argument `{option_string}`'
-                    if str(ex):
-                        message += '; ' + str(ex)
-                    if not message.endswith('.'):
-                        message += '.'
-                    raise ValueError(message)
-                else:
-                    if isinstance(value, dict):
-                        value = LeafDict(value)
-                    setattr(namespace, self.dest, value)
-
-        # gather the nested config fields
-        def get_field_help(field_info: ObjectFieldInfo):
-            config_help = field_info.description or ''
-            default_value = field_info.get_default()
-            if config_help:
-                config_help += ' '
-            if default_value is NOT_SET:
-                if field_info.required:
-                    config_help += '(required'
-                else:
-                    config_help += '(optional'
-            else:
-                config_help += f'(default {default_value!r}'
-            if field_info.choices:
-                config_help += f'; choices {list(field_info.choices)}'
-            config_help += ')'
-            return config_help
-
-        def gather_args(ti: ObjectTypeInfo, prefix: str):
-            if prefix:
-                prefix += '.'
-
-            for field_name in sorted(ti.fields):
-                field_info = ti.fields[field_name]
-                if isinstance(field_info.type_info, ObjectTypeInfo):
-                    gather_args(field_info.type_info, prefix + field_name)
-                else:
-                    option_string = f'--{prefix}{field_name}'
-                    help_msg = get_field_help(field_info)
-                    parser.add_argument(
-                        option_string, help=help_msg,
-                        action=_ConfigAction, type_info=field_info.type_info,
-                        default=NOT_SET, metavar=str(field_info.type_info),
-                    )
-
-        # populate the arguments
+        # populate the arguments according to the flattened field specs,
+        # which are computed once per Config class and cached; the actions
+        # are constructed directly and registered via `_add_action`,
+        # bypassing the per-argument validation of `add_argument` (all
+        # option strings are known to be well-formed and conflict-free)
         if parser is None:
-            parser = ArgumentParser()
-        gather_args(type_info(self.config_cls), '')
+            # argparse parsers are reusable across `parse_args` calls, so
+            # the self-built parser is constructed only once per loader
+            if self._cached_parser is not None:
+                return self._cached_parser
+            parser = self._cached_parser = ArgumentParser()
+        add_action = parser._add_action
+        for option_string, help_msg, metavar, field_info in \
+                _arg_specs_for(self.config_cls):
+            add_action(_ConfigAction(
+                type_info=field_info.type_info,
+                option_strings=[option_string], dest=option_string[2:],
+                default=NOT_SET, help=help_msg, metavar=metavar,
+            ))
 
         return parser
 
@@ -966,8 +1309,50 @@ class ConfigLoader(Generic[TConfig]):
         Args:
             args: The CLI arguments.
         """
-        parser = self.build_arg_parser()
-        namespace = parser.parse_args(list(args))
-        parsed = {key: value for key, value in vars(namespace).items()
-                  if value is not NOT_SET}
+        if not isinstance(args, (list, tuple)):
+            args = list(args)
+        parsed = self._parse_args_fast(args)
+        if parsed is None:
+            # argparse copies the sequence itself, no need to do it here
+            parser = self.build_arg_parser()
+            namespace = parser.parse_args(args)
+            parsed = {key: value for key, value in vars(namespace).items()
+                      if value is not NOT_SET}
         self.load_object(parsed)
+
+    def _parse_args_fast(self, args: Sequence[str]
+                         ) -> Optional[Dict[str, Any]]:
+        """
+        Parse CLI arguments without argparse, which exhibits quadratic
+        behavior in the number of registered options on CPython < 3.13.
+
+        Every argument must take the form ``--key=value`` with `key` being
+        a known field; otherwise :obj:`None` is returned, and the caller
+        should fall back to a full argparse parser (which also serves
+        ``--help`` and abbreviated options).
+        """
+        field_map = _arg_field_map_for(self.config_cls)
+        parsed = {}
+        for arg in args:
+            m = _FAST_CLI_ARG.fullmatch(arg)
+            if m is None:
+                return None
+            key, value = m.group(1), m.group(2)
+            field_info = field_map.get(key)
+            if field_info is None:
+                return None
+            try:
+                context = TypeCheckContext()
+                with context.enter(f'.{key}'):
+                    value = field_info.type_info.parse_string(value, context)
+            except Exception as ex:
+                message = f'Invalid value for argument `--{key}`'
+                if str(ex):
+                    message += '; ' + str(ex)
+                if not message.endswith('.'):
+                    message += '.'
+                raise ValueError(message)
+            if isinstance(value, dict):
+                value = LeafDict(value)
+            parsed[key] = value
+        return parsed
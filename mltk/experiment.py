@@ -1,9 +1,9 @@
-import codecs
+import hashlib
 import os
 import shutil
 import sys
+import time
 import zipfile
-from tempfile import TemporaryDirectory
 from typing import *
 
 from .config import Config, ConfigLoader, config_to_dict, config_defaults
@@ -89,7 +89,8 @@ class Experiment(Generic[TConfig]):
                  output_dir: Optional[str] = None,
                  load_config_file: bool = True,
                  save_config_file: bool = True,
-                 args: Optional[Iterable[str]] = NOT_SET):
+                 args: Optional[Iterable[str]] = NOT_SET,
+                 flush_interval: float = 5.0):
         """
         Construct a new :class:`Experiment`.
 
@@ -106,6 +107,11 @@ class Experiment(Generic[TConfig]):
                 values into `output_dir + "/config.json"`?
             args: The CLI arguments.  If not specified, use ``sys.argv[1:]``.
                 Specifying :obj:`None` will disable parsing the arguments.
+            flush_interval: The minimum number of seconds between two
+                writes of the result file triggered by
+                :meth:`update_results()`.  Deferred updates are flushed
+                when exiting the experiment context, or by calling
+                :meth:`flush()` explicitly.
         """
         # validate the arguments
         config_or_cls_okay = True
@@ -139,7 +145,9 @@ class Experiment(Generic[TConfig]):
         if args is NOT_SET:
             args = sys.argv[1:]
         if args is not None:
-            args = tuple(map(str, args))
+            args = tuple(args)
+            if not all(isinstance(a, str) for a in args):
+                args = tuple(str(a) for a in args)
 
         # memorize the arguments
         self._script_name = script_name
@@ -148,9 +156,17 @@ class Experiment(Generic[TConfig]):
         self._load_config_file = load_config_file
         self._save_config_file = save_config_file
         self._args = args
+        self._flush_interval = flush_interval
 
         # internal state of experiment
         self._results = {}  # type: ResultDict
+        self._results_loaded = False
+        self._results_dirty = False
+        self._last_flush_time = 0.0
+        self._ensured_dirs = set()  # type: Set[str]
+        self._last_config_hash = None  # type: Optional[bytes]
+        self._last_results_hash = None  # type: Optional[bytes]
+        self._defaults_json = None  # type: Optional[Tuple[type, str]]
 
         # the event
         self._events = EventHost()
@@ -202,6 +218,11 @@ class Experiment(Generic[TConfig]):
         """Get the CLI arguments of this experiment."""
         return self._args
 
+    @property
+    def flush_interval(self) -> float:
+        """Get the minimum interval between result flushes, in seconds."""
+        return self._flush_interval
+
     @property
     def results(self) -> ResultDict:
         """
@@ -251,31 +272,67 @@ class Experiment(Generic[TConfig]):
         """
         return self._on_exit
 
+    @staticmethod
+    def _content_hash(content: str) -> bytes:
+        return hashlib.blake2b(content.encode('utf-8'),
+                               digest_size=16).digest()
+
+    @staticmethod
+    def _atomic_write(path: str, content: str):
+        # write to a temporary file, then swap it in place, such that a
+        # partial write cannot corrupt the target file
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
     def save_config(self):
         """
         Save the config values into `output_dir + "/config.json"`, and the
         default config values into `output_dir + "/config.defaults.json"`.
+
+        The write is skipped when the contents are unchanged since the
+        last :meth:`save_config()` call.
         """
         config_json = json_dumps(config_to_dict(self.config, flatten=True))
-        default_config_json = json_dumps(
-            config_to_dict(config_defaults(self.config), flatten=True))
 
-        with codecs.open(os.path.join(self.output_dir, 'config.json'),
-                         'wb', 'utf-8') as f:
-            f.write(config_json)
-        with codecs.open(os.path.join(self.output_dir, 'config.defaults.json'),
-                         'wb', 'utf-8') as f:
-            f.write(default_config_json)
+        # the default values depend only on the config class, so they are
+        # serialized just once per class (the live config above cannot be
+        # memoized, since it may be mutated in place)
+        config_cls = self.config.__class__
+        if self._defaults_json is None or \
+                self._defaults_json[0] is not config_cls:
+            self._defaults_json = (config_cls, json_dumps(
+                config_to_dict(config_defaults(config_cls), flatten=True)))
+        default_config_json = self._defaults_json[1]
+
+        content_hash = self._content_hash(
+            f'{config_json}\0{default_config_json}')
+        if content_hash == self._last_config_hash:
+            return
+
+        self._atomic_write(
+            os.path.join(self.output_dir, 'config.json'), config_json)
+        self._atomic_write(
+            os.path.join(self.output_dir, 'config.defaults.json'),
+            default_config_json)
+        self._last_config_hash = content_hash
+
+    def _ensure_results_loaded(self):
+        """
+        Merge the results from `output_dir + "/result.json"` into the
+        in-memory result dict, once per Experiment; in-memory values take
+        precedence over the values loaded from disk.
+        """
+        if self._results_loaded:
+            return
+        self._results_loaded = True
 
-    def save_results(self):
-        """Save the result dict to `output_dir + "/result.json"`."""
         result_file = os.path.join(self.output_dir, 'result.json')
-
-        # load the original results
         old_result = None
         if os.path.isfile(result_file):
             try:
-                with codecs.open(result_file, 'rb', 'utf-8') as f:
+                with open(result_file, 'r', encoding='utf-8') as f:
                     result_json = f.read()
                 if result_json:
                     old_result = json_loads(result_json)
@@ -284,23 +341,45 @@ class Experiment(Generic[TConfig]):
             except Exception:  # pragma: no cover
                 raise IOError('Cannot load the existing old result.')
 
-        # merge the new result with the old result
         if old_result is not None:
-            old_result.update(self.results)
-            results = old_result
-        else:
-            results = self.results
+            old_result.update(self._results)
+            self._results.clear()
+            self._results.update(old_result)
 
-        # now save the new results
+    def save_results(self):
+        """Save the result dict to `output_dir + "/result.json"`."""
+        result_file = os.path.join(self.output_dir, 'result.json')
+
+        # the results on disk are merged in only once; afterwards the
+        # in-memory dict is the source of truth
+        self._ensure_results_loaded()
+        results = self._results
+
+        # now save the new results, unless unchanged since the last save
         if results:
             result_json = json_dumps(results)
-            with codecs.open(result_file, 'wb', 'utf-8') as f:
-                f.write(result_json)
+            content_hash = self._content_hash(result_json)
+            if content_hash != self._last_results_hash:
+                self._atomic_write(result_file, result_json)
+                self._last_results_hash = content_hash
+
+        self._results_dirty = False
+        self._last_flush_time = time.monotonic()
+
+    def flush(self):
+        """Save any deferred result updates to disk immediately."""
+        if self._results_dirty:
+            self.save_results()
 
     def update_results(self, results: Optional[ResultDict] = None, **kwargs):
         """
         Update the result dict, and save modifications to disk.
 
+        To avoid excessive disk writes inside tight training loops, the
+        actual write is coalesced: it happens at most once per
+        `flush_interval` seconds.  Deferred updates are flushed when
+        exiting the experiment context, or by calling :meth:`flush()`.
+
         Args:
             results: The dict of updates.
             **kwargs: The named arguments of updates.
@@ -308,7 +387,9 @@ class Experiment(Generic[TConfig]):
         results = dict(results or ())
         results.update(kwargs)
         self._results.update(results)
-        self.save_results()
+        self._results_dirty = True
+        if time.monotonic() - self._last_flush_time >= self._flush_interval:
+            self.save_results()
 
     def abspath(self, relpath: str) -> str:
         """
@@ -335,7 +416,9 @@ class Experiment(Generic[TConfig]):
             The absolute path of `relpath`.
         """
         path = self.abspath(relpath)
-        os.makedirs(path, exist_ok=exist_ok)
+        if not exist_ok or path not in self._ensured_dirs:
+            os.makedirs(path, exist_ok=exist_ok)
+            self._ensured_dirs.add(path)
         return path
 
     def make_parent(self, relpath: str, exist_ok: bool = True) -> str:
@@ -354,7 +437,9 @@ class Experiment(Generic[TConfig]):
         """
         path = self.abspath(relpath)
         parent_dir = os.path.split(path)[0]
-        os.makedirs(parent_dir, exist_ok=exist_ok)
+        if not exist_ok or parent_dir not in self._ensured_dirs:
+            os.makedirs(parent_dir, exist_ok=exist_ok)
+            self._ensured_dirs.add(parent_dir)
         return path
 
     def open_file(self, relpath: str, mode: str, encoding: Optional[str] = None,
@@ -385,7 +470,11 @@ class Experiment(Generic[TConfig]):
         if encoding is None:
             return open(path, mode)
         else:
-            return codecs.open(path, mode, encoding)
+            # the built-in io stack is much faster than the codecs stream
+            # wrappers; `newline=''` preserves the codecs behavior of not
+            # translating line endings
+            return open(path, mode.replace('b', ''), encoding=encoding,
+                        newline='')
 
     def put_file_content(self,
                          relpath: str,
@@ -442,17 +531,19 @@ class Experiment(Generic[TConfig]):
         Returns:
             The absolute path of the archive file.
         """
-        def _copy_dir(src: str, dst: str):
-            os.makedirs(dst, exist_ok=True)
-
-            for name in os.listdir(src):
-                f_src = os.path.join(src, name)
-                f_dst = os.path.join(dst, name)
-
-                if os.path.isdir(f_src):
-                    _copy_dir(f_src, f_dst)
-                else:
-                    shutil.copyfile(f_src, f_dst, follow_symlinks=False)
+        def gather_entries(path, relpath, entries):
+            # the arcname convention mirrors `make_dir_archive`; `scandir`
+            # gives the entry type without a stat() call per entry
+            with os.scandir(path) as it:
+                for entry in sorted(it, key=lambda e: e.name):
+                    f_relpath = \
+                        f'{relpath}/{entry.name}' if relpath else entry.name
+                    if entry.is_dir():
+                        entries.append((entry.path, f_relpath, True))
+                        gather_entries(entry.path, f_relpath, entries)
+                    else:
+                        entries.append((entry.path, f_relpath, False))
+            return entries
 
         source_dir = self.abspath(source_dir)
         if not os.path.isdir(source_dir):
@@ -467,20 +558,47 @@ class Experiment(Generic[TConfig]):
             parent_dir = os.path.dirname(archive_file)
             os.makedirs(parent_dir, exist_ok=True)
 
-        # if the archive already exists, extract it, merge the contents
-        # in `source_dir` with the extracted files, and then make archive.
+        # if the archive already exists, append the new entries to it
+        # in place, instead of extracting and re-packing the whole archive
         if os.path.isfile(archive_file):
-            with TemporaryDirectory() as temp_dir:
-                # extract the original zip
-                with zipfile.ZipFile(archive_file, 'r') as zf:
-                    zf.extractall(temp_dir)
-
-                # merge the content
-                _copy_dir(source_dir, temp_dir)
-
-                # make the destination archive
-                prepare_parent()
-                make_dir_archive(temp_dir, archive_file)
+            entries = gather_entries(source_dir, '', [])
+
+            with zipfile.ZipFile(archive_file, 'a') as zf:
+                existing = set(zf.namelist())
+                has_collision = any(
+                    not is_dir and arcname in existing
+                    for _, arcname, is_dir in entries
+                )
+                if not has_collision:
+                    for f_path, arcname, is_dir in entries:
+                        if not is_dir or f'{arcname}/' not in existing:
+                            zf.write(f_path, arcname=arcname)
+
+            # entries overridden by the source require a rebuild, since
+            # duplicate names must not appear in the archive; stream the
+            # merged archive to a temporary file, then swap it in place
+            if has_collision:
+                tmp_file = archive_file + '.incoming'
+                try:
+                    with zipfile.ZipFile(archive_file, 'r') as old_zf, \
+                            zipfile.ZipFile(
+                                tmp_file, 'w',
+                                compression=zipfile.ZIP_STORED) as zf:
+                        written = set()
+                        for f_path, arcname, is_dir in entries:
+                            zf.write(f_path, arcname=arcname)
+                            written.add(f'{arcname}/' if is_dir else arcname)
+                        for info in old_zf.infolist():
+                            if info.filename in written:
+                                continue
+                            if info.filename.endswith('/'):
+                                zf.writestr(info, b'')
+                            else:
+                                zf.writestr(info, old_zf.read(info.filename))
+                    os.replace(tmp_file, archive_file)
+                finally:
+                    if os.path.isfile(tmp_file):
+                        os.remove(tmp_file)
 
         # otherwise pack the zip archive directly
         else:
@@ -490,6 +608,12 @@ class Experiment(Generic[TConfig]):
         # now delete the source directory
         if delete_source:
             shutil.rmtree(source_dir)
+            # drop the deleted directories from the mkdir cache
+            prefix = source_dir + os.sep
+            self._ensured_dirs = {
+                d for d in self._ensured_dirs
+                if d != source_dir and not d.startswith(prefix)
+            }
 
         return archive_file
 
@@ -522,10 +646,14 @@ class Experiment(Generic[TConfig]):
         # build the argument parser
         if self.args is not None:
             arg_parser = config_loader.build_arg_parser()
-            arg_parser.add_argument(
-                '--output-dir', help='Specify the experiment output directory.',
-                default=NOT_SET
-            )
+            # the parser is cached on the loader, so extend it only once
+            if not getattr(arg_parser, '_mltk_output_dir_added', False):
+                arg_parser.add_argument(
+                    '--output-dir',
+                    help='Specify the experiment output directory.',
+                    default=NOT_SET
+                )
+                arg_parser._mltk_output_dir_added = True
             parsed_args = arg_parser.parse_args(self.args)
 
             output_dir = parsed_args.output_dir
@@ -560,6 +688,10 @@ class Experiment(Generic[TConfig]):
         # prepare for the output dir
         os.makedirs(self.output_dir, exist_ok=True)
 
+        # merge any previously saved results, now that the output dir
+        # has been finalized
+        self._ensure_results_loaded()
+
         # save the configuration
         if self._save_config_file:
             self.save_config()
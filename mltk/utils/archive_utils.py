@@ -20,6 +20,13 @@ TAR_FILE_EXTENSIONS = ('.tar',
                        '.tar.bz2', '.tbz', '.tbz2', '.tb2',
                        '.tar.xz', '.txz')
 
+_STORED_FILE_EXTENSIONS = frozenset([
+    # file formats that are already compressed, for which re-compressing
+    # with DEFLATE burns CPU for virtually no size reduction
+    '.7z', '.bz2', '.gz', '.jpeg', '.jpg', '.mp3', '.mp4', '.npz',
+    '.parquet', '.png', '.rar', '.webp', '.xz', '.zip',
+])
+
 
 def make_dir_archive(dir_path: str,
                      archive_path: str,
@@ -36,7 +43,9 @@ def make_dir_archive(dir_path: str,
             a file should be included in the archive.
         is_excluded: A callable ``(path) -> bool`` to check whether or not
             a directory or a file should be excluded in the archive.
-        compression: The compression level.
+        compression: The compression level.  Files in already-compressed
+            formats (e.g., ".npz", ".png", ".gz") are always stored
+            uncompressed, regardless of this argument.
     """
     if not os.path.isdir(dir_path):
         raise IOError(f'Not a directory: {dir_path}')
@@ -53,7 +62,13 @@ def make_dir_archive(dir_path: str,
                 zf.write(f_path, arcname=f_relpath)
                 walk(f_path, f_relpath)
             elif is_included is None or is_included(f_path):
-                zf.write(f_path, arcname=f_relpath)
+                ext = os.path.splitext(name)[1].lower()
+                zf.write(
+                    f_path, arcname=f_relpath,
+                    compress_type=(zipfile.ZIP_STORED
+                                   if ext in _STORED_FILE_EXTENSIONS
+                                   else None)
+                )
 
     with zipfile.ZipFile(archive_path, 'w', compression=compression) as zf:
         walk(dir_path, '')
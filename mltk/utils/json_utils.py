@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from typing import Any, Tuple
 from uuid import UUID
@@ -66,6 +67,16 @@ def json_dumps(o: Any, *, separators: Tuple[str, str] = (',', ':'),
     Returns:
         The JSON text.
     """
+    if not kwargs and not allow_nan:
+        # Fast path: objects composed of plain JSON-native types (the common
+        # case for configs and results) can be serialized by the stdlib C
+        # encoder directly, skipping the recursive conversion and the
+        # BSON-aware encoder.  Any NumPy or MongoDB type, as well as `NaN`
+        # and `Infinity`, will trigger the fallback below.
+        try:
+            return json.dumps(o, separators=separators, allow_nan=False)
+        except (TypeError, ValueError):
+            pass
     return dumps(
         _json_convert(o), json_options=JSON_OPTIONS, separators=separators,
         allow_nan=allow_nan, **kwargs
@@ -98,4 +109,10 @@ def json_loads(s: str, **kwargs) -> Any:
     Returns:
         The deserialized object.
     """
+    if not kwargs and (b'$' if isinstance(s, bytes) else '$') not in s:
+        # Fast path: without "$"-prefixed keys there is nothing for the
+        # MongoDB extended JSON decoder to transform, so the stdlib C
+        # scanner (not slowed down by an `object_hook`) gives an identical
+        # result.
+        return json.loads(s)
     return loads(s, json_options=JSON_OPTIONS, **kwargs)
@@ -10,7 +10,6 @@ from pathlib import Path
 from typing import *
 
 import numpy as np
-import yaml
 
 from .misc import NOT_SET, Singleton, deep_copy, PatternType
 
@@ -34,6 +33,17 @@ TObject = TypeVar('TObject')
 TYPE_INFO_MAGIC_FIELD = '__type_info__'
 """If a class provides this magic field, :func:`type_info` will return it."""
 
+_YamlSafeLoader = None
+"""The YAML loader used to parse strings, resolved lazily."""
+
+_PLAIN_WORD_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_\-]*')
+"""Pattern of strings that YAML cannot resolve to a non-string scalar."""
+
+_YAML_KEYWORDS = frozenset([
+    'true', 'false', 'yes', 'no', 'on', 'off', 'null',
+])
+"""Words that YAML resolves to booleans or null (in some letter case)."""
+
 
 class TypeCheckError(ValueError):
     """Represent a type check error."""
@@ -102,10 +112,26 @@ class TypeCheckError(ValueError):
         return err_msg
 
 
+class _ScopeGuard(object):
+    """Context manager that pops one scope from the stack on exit."""
+
+    __slots__ = ('_scopes',)
+
+    def __init__(self, scopes: List[str]):
+        self._scopes = scopes
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._scopes.pop()
+
+
 class TypeCheckContext(object):
     """Maintain the context for type check."""
 
-    __slots__ = ('strict', 'ignore_missing', '_errors', '_scopes')
+    __slots__ = ('strict', 'ignore_missing', '_errors', '_scopes',
+                 '_scope_guard')
 
     def __init__(self,
                  strict: bool = False,
@@ -124,6 +150,7 @@ class TypeCheckContext(object):
         self.strict = strict
         self.ignore_missing = ignore_missing
         self._scopes: List[str] = []
+        self._scope_guard = _ScopeGuard(self._scopes)
 
     @contextmanager
     def scoped_set_strict(self, strict: bool):
@@ -134,13 +161,12 @@ class TypeCheckContext(object):
         finally:
             self.strict = old_strict
 
-    @contextmanager
-    def enter(self, scope: str):
-        try:
-            self._scopes.append(scope)
-            yield
-        finally:
-            self._scopes.pop()
+    def enter(self, scope: str) -> _ScopeGuard:
+        # scope entry is on the successful validation path for every
+        # field, so a shared guard object is used instead of creating a
+        # generator-based context manager per call
+        self._scopes.append(scope)
+        return self._scope_guard
 
     def get_path(self) -> str:
         return '.'.join(self._scopes)
@@ -170,10 +196,22 @@ class TypeInfo(Generic[TObject]):
             context.raise_error(causes=[ex])
 
     def _parse_string(self, s: str, context: TypeCheckContext) -> TObject:
-        try:
-            o = yaml.load(s, Loader=yaml.SafeLoader)
-        except yaml.YAMLError:
+        # identifier-like words (the common CLI case) cannot resolve to
+        # anything but themselves, so YAML parsing is skipped for them
+        if _PLAIN_WORD_PATTERN.fullmatch(s) is not None and \
+                s.lower() not in _YAML_KEYWORDS:
             o = s
+        else:
+            global _YamlSafeLoader
+            import yaml  # deferred, to keep module import time low
+            if _YamlSafeLoader is None:
+                # prefer the LibYAML-backed loader when it is installed
+                _YamlSafeLoader = getattr(yaml, 'CSafeLoader',
+                                          yaml.SafeLoader)
+            try:
+                o = yaml.load(s, Loader=_YamlSafeLoader)
+            except yaml.YAMLError:
+                o = s
         with context.scoped_set_strict(False):
             return self._check_value(o, context)
 
@@ -202,6 +240,10 @@ generic_alias_types = (type(Tuple[int]), type(Tuple[int, ...]),
 is_subclass_safe = lambda t, base: isinstance(t, type) and issubclass(t, base)
 
 
+_TYPE_INFO_CACHE: Dict[Any, 'TypeInfo'] = {}
+"""Compiled type information, keyed by the type annotation object."""
+
+
 def type_info(type_) -> 'TypeInfo':
     """
     Get the compiled type information for specified Python `type_`.
@@ -212,6 +254,26 @@ def type_info(type_) -> 'TypeInfo':
     Returns:
         The compiled type information object.
     """
+    # classes carrying a compiled TypeInfo in the magic attribute (e.g.,
+    # Config classes) are already cached by the attribute itself
+    if isinstance(type_, type) and hasattr(type_, TYPE_INFO_MAGIC_FIELD):
+        return getattr(type_, TYPE_INFO_MAGIC_FIELD)
+
+    # generic aliases compare equal regardless of argument order (e.g.,
+    # ``Union[float, int] == Union[int, float]``), so the (order-sensitive)
+    # argument tuple must take part in the cache key
+    args = getattr(type_, '__args__', None)
+    key = type_ if args is None else (type_, args)
+    try:
+        ti = _TYPE_INFO_CACHE.get(key)
+    except TypeError:  # unhashable annotation object
+        return _build_type_info(type_)
+    if ti is None:
+        ti = _TYPE_INFO_CACHE[key] = _build_type_info(type_)
+    return ti
+
+
+def _build_type_info(type_) -> 'TypeInfo':
     if type_ is None or type_ == type(None):
         return NoneTypeInfo()
 
@@ -394,6 +456,8 @@ class IntTypeInfo(PrimitiveTypeInfo[int]):
     """
 
     def _check_value(self, o: Any, context: TypeCheckContext) -> int:
+        if type(o) is int:  # exact match, no coercion needed
+            return o
         if not context.strict:
             int_value = int(o)
             float_value = float(o)
@@ -423,6 +487,8 @@ class FloatTypeInfo(PrimitiveTypeInfo[float]):
     """
 
     def _check_value(self, o: Any, context: TypeCheckContext) -> float:
+        if type(o) is float:  # exact match, no coercion needed
+            return o
         if not context.strict:
             o = float(o)
         if not isinstance(o, float):
@@ -447,6 +513,8 @@ class BoolTypeInfo(PrimitiveTypeInfo[bool]):
     """
 
     def _check_value(self, o: Any, context: TypeCheckContext) -> bool:
+        if type(o) is bool:  # exact match, no coercion needed
+            return o
         if not context.strict:
             if isinstance(o, (str, bytes)):
                 o = str(o).lower()
@@ -484,6 +552,8 @@ class StrTypeInfo(PrimitiveTypeInfo[str]):
     """
 
     def _check_value(self, o: Any, context: TypeCheckContext) -> str:
+        if type(o) is str:  # exact match, no coercion needed
+            return o
         if not context.strict:
             if isinstance(o, bytes):
                 o = o.decode('utf-8')
@@ -1034,6 +1104,29 @@ class ObjectFieldInfo(object):
         return ObjectFieldInfo(**key_values)
 
 
+_CHECKER_ARGSPEC_CACHE: Dict[Any, Tuple[bool, bool]] = {}
+"""Memoized ``(include_values, include_field)`` flags per callback function."""
+
+
+def _checker_callback_flags(callback) -> Tuple[bool, bool]:
+    # Inspecting the signature is expensive, and the same underlying
+    # function is re-wrapped once per Config subclass that inherits the
+    # checker, so memoize the result keyed by the unbound function.
+    func = getattr(callback, '__func__', callback)
+    try:
+        return _CHECKER_ARGSPEC_CACHE[func]
+    except (KeyError, TypeError):
+        spec = inspect.getfullargspec(callback)
+        include_values = ('values' in spec.args) or (spec.varkw is not None)
+        include_field = ('field' in spec.args) or (spec.varkw is not None)
+        flags = (include_values, include_field)
+        try:
+            _CHECKER_ARGSPEC_CACHE[func] = flags
+        except TypeError:  # pragma: no cover
+            pass
+        return flags
+
+
 class ObjectFieldChecker(object):
     """Custom type checker for fields of an object."""
 
@@ -1070,9 +1163,7 @@ class ObjectFieldChecker(object):
 
         # parse the argument specification of `callback`, and wrap it
         # by unified function interface ``(v, values, fields) -> None``
-        spec = inspect.getfullargspec(callback)
-        include_values = ('values' in spec.args) or (spec.varkw is not None)
-        include_field = ('field' in spec.args) or (spec.varkw is not None)
+        include_values, include_field = _checker_callback_flags(callback)
         if not include_values and not include_field:
             wrapped_callback = \
                 lambda v, values, field: callback(v)
@@ -1185,7 +1276,9 @@ class ObjectTypeInfo(TypeInfo[TObject]):
     MyObject(value=789, name='Bob')
     """
 
-    __slots__ = ('object_type', 'fields', 'field_checkers', 'root_checkers')
+    __slots__ = ('object_type', 'fields', 'field_checkers', 'root_checkers',
+                 '_pre_field_checkers', '_post_field_checkers',
+                 '_pre_root_checkers', '_post_root_checkers')
 
     def __init__(self,
                  object_type: Type[TObject],
@@ -1196,6 +1289,20 @@ class ObjectTypeInfo(TypeInfo[TObject]):
         self.fields = ObjectFieldsDict(fields)
         self.field_checkers = HashableList(field_checkers or [])
         self.root_checkers = HashableList(root_checkers or [])
+        # the checker lists are fixed once the type info is constructed,
+        # so split them by phase up front instead of testing ``.pre``
+        # on every validation call; the resolved callables are stored
+        # alongside, saving the ``__call__`` indirection per invocation
+        self._pre_field_checkers = tuple(
+            (c.fields, c._wrapped_callback)
+            for c in self.field_checkers if c.pre)
+        self._post_field_checkers = tuple(
+            (c.fields, c._wrapped_callback)
+            for c in self.field_checkers if not c.pre)
+        self._pre_root_checkers = \
+            tuple(c.callback for c in self.root_checkers if c.pre)
+        self._post_root_checkers = \
+            tuple(c.callback for c in self.root_checkers if not c.pre)
 
     def __str__(self):
         return self.object_type.__qualname__
@@ -1206,14 +1313,20 @@ class ObjectTypeInfo(TypeInfo[TObject]):
                f'field_checkers={self.field_checkers}, ' \
                f'root_checkers={self.root_checkers})>'
 
+    # equality and hashing only consider the public attributes; the
+    # underscored slots are derived from `field_checkers`/`root_checkers`
+    _EQUALITY_KEYS = ('object_type', 'fields',
+                      'field_checkers', 'root_checkers')
+
     def __eq__(self, other):
         return isinstance(other, ObjectTypeInfo) and \
-            all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+            all(getattr(self, k) == getattr(other, k)
+                for k in self._EQUALITY_KEYS)
 
     def __hash__(self):
         return hash(
             (ObjectTypeInfo,) +
-            tuple(getattr(self, k) for k in self.__slots__)
+            tuple(getattr(self, k) for k in self._EQUALITY_KEYS)
         )
 
     def _check_value(self, o: Any, context: TypeCheckContext) -> TObject:
@@ -1267,24 +1380,22 @@ class ObjectTypeInfo(TypeInfo[TObject]):
                 kv = copy.copy(o.__dict__)
 
         # run the root pre-checkers and field pre-checkers
-        for checker in self.root_checkers:
-            if checker.pre:
-                ret = checker(kv)
-                if ret is not None:
-                    kv = ret
+        for callback in self._pre_root_checkers:
+            ret = callback(kv)
+            if ret is not None:
+                kv = ret
 
         field_names = list(kv)
-        for checker in self.field_checkers:
-            if checker.pre:
-                for field_name in checker.fields:
-                    if field_name == '*':
-                        for k in field_names:
-                            with context.enter(k):
-                                kv[k] = checker(kv[k], kv, k)
-                    if field_name in kv:
-                        with context.enter(field_name):
-                            kv[field_name] = checker(
-                                kv[field_name], kv, field_name)
+        for checker_fields, callback in self._pre_field_checkers:
+            for field_name in checker_fields:
+                if field_name == '*':
+                    for k in field_names:
+                        with context.enter(k):
+                            kv[k] = callback(kv[k], kv, k)
+                if field_name in kv:
+                    with context.enter(field_name):
+                        kv[field_name] = callback(
+                            kv[field_name], kv, field_name)
 
         # check the fields by registered checkers
         for field_name, field_info in self.fields.items():
@@ -1333,11 +1444,10 @@ class ObjectTypeInfo(TypeInfo[TObject]):
         o = self.object_type(**kv)
 
         # run the root post-checkers and field post-checkers
-        for checker in self.root_checkers:
-            if not checker.pre:
-                ret = checker(o)
-                if ret is not None:
-                    o = ret
+        for callback in self._post_root_checkers:
+            ret = callback(o)
+            if ret is not None:
+                o = ret
 
         if hasattr(o, '__getitem__') and hasattr(o, '__iter__'):
             field_names = list(o)
@@ -1354,23 +1464,22 @@ class ObjectTypeInfo(TypeInfo[TObject]):
             field_names = list(o.__dict__)
             object_get, object_contains, object_set = getattr, hasattr, setattr
 
-        for checker in self.field_checkers:
-            if not checker.pre:
-                for field_name in checker.fields:
-                    if field_name == '*':
-                        for k in field_names:
-                            with context.enter(k):
-                                object_set(
-                                    o,
-                                    k,
-                                    checker(object_get(o, k), o, k)
-                                )
-                    elif object_contains(o, field_name):
-                        with context.enter(field_name):
+        for checker_fields, callback in self._post_field_checkers:
+            for field_name in checker_fields:
+                if field_name == '*':
+                    for k in field_names:
+                        with context.enter(k):
                             object_set(
                                 o,
-                                field_name,
-                                checker(object_get(o, field_name), o, field_name)
+                                k,
+                                callback(object_get(o, k), o, k)
                             )
+                elif object_contains(o, field_name):
+                    with context.enter(field_name):
+                        object_set(
+                            o,
+                            field_name,
+                            callback(object_get(o, field_name), o, field_name)
+                        )
 
         return o
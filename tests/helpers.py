@@ -1,7 +1,6 @@
 import os
 import stat
 import unittest
-import zipfile
 from contextlib import contextmanager
 from typing import *
 
@@ -29,24 +28,45 @@ def remote_test(method):
         'remote tests are skipped in fast test and local test mode')(method)
 
 
+def _read_bytes(path):
+    # read a whole file via raw fd ops, skipping the buffered-reader setup
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+
 def get_file_content(path):
-    with open(path, 'rb') as f:
-        return f.read()
+    return _read_bytes(path)
 
 
 def write_file_content(path, content):
-    with open(path, 'wb') as f:
-        f.write(content)
+    # write via raw fd ops, skipping the buffered-writer setup; the test
+    # fixtures are small enough for a single write call
+    fd = os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
 
 
 def dir_snapshot(path):
+    # a single os.walk pass (scandir-based, no extra stat per entry)
+    # builds the whole nested dict without Python-level recursion
     ret = {}
-    for name in os.listdir(path):
-        f_path = os.path.join(path, name)
-        if os.path.isdir(f_path):
-            ret[name] = dir_snapshot(f_path)
-        else:
-            ret[name] = get_file_content(f_path)
+    dir_nodes = {path: ret}
+    for parent, dir_names, file_names in os.walk(path, followlinks=False):
+        node = dir_nodes[parent]
+        for name in dir_names:
+            dir_nodes[os.path.join(parent, name)] = node[name] = {}
+        for name in file_names:
+            node[name] = _read_bytes(os.path.join(parent, name))
     return ret
 
 
@@ -62,6 +82,10 @@ def prepare_dir(path, snapshot):
 
 
 def zip_snapshot(path):
+    # `zipfile` is imported lazily, so that test runs which never touch
+    # an archive do not pay for it (and its zlib/struct dependencies)
+    import zipfile
+
     ret = {}
 
     def put_entry(arcname, cnt):
@@ -76,11 +100,15 @@ def zip_snapshot(path):
         t[segments[-1]] = cnt
 
     with zipfile.ZipFile(path, 'r') as zip_file:
-        for e in zip_file.infolist():
+        # open entries via their ZipInfo in file order, so that no
+        # name-to-info lookup is repeated and reads stay sequential
+        for e in sorted(zip_file.infolist(),
+                        key=lambda info: info.header_offset):
             if e.filename.endswith('/'):
                 put_entry(e.filename, {})
             else:
-                put_entry(e.filename, zip_file.read(e.filename))
+                with zip_file.open(e) as src:
+                    put_entry(e.filename, src.read())
 
     return ret
 
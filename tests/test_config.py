@@ -298,6 +298,18 @@ class ConfigTestCase(unittest.TestCase):
             _ = config_defaults(123)
 
 
+@pytest.mark.skipif(
+    os.environ.get('REQUIRE_LIBYAML', '0') != '1',
+    reason='only checked when REQUIRE_LIBYAML=1 is set')
+def test_yaml_c_loader_available():
+    # the config loader prefers yaml.CSafeLoader but falls back to the
+    # pure-Python SafeLoader when the libyaml bindings are absent; CI
+    # environments where libyaml is mandatory can set REQUIRE_LIBYAML=1
+    # to fail loudly if the fast loader regresses to the fallback
+    import yaml
+    assert hasattr(yaml, 'CSafeLoader'), 'libyaml bindings not installed'
+
+
 class ConfigLoaderTestCase(unittest.TestCase):
 
     def test_construction(self):
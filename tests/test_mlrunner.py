@@ -1,13 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import os
+import pickle
 import re
 import socket
-import sys
 import time
 import unittest
 from contextlib import contextmanager
-from tempfile import TemporaryDirectory
 
 import httpretty
 import mock
@@ -24,6 +23,43 @@ from mltk.mlrunner import (ProgramHost, MLRunnerConfig, SourceCopier,
 from mltk.utils import json_dumps, json_loads
 from tests.helpers import *
 
+# pre-compiled patterns shared by the `source.includes` / `source.excludes`
+# checks below, so that each test run does not re-compile the same literals
+_EXE_PATTERN = re.compile(r'.*\.exe$')
+_SVN_PATTERN = re.compile(r'.*/\.svn$')
+
+# the expected validation error messages, compiled once and kept here so
+# they can be grep'd in one place
+_ERR_SERVER_REQUIRED = re.compile(r'\'server\' is required.')
+_ERR_ARGS_REQUIRED = re.compile(r'\'args\' is required.')
+_ERR_ARGS_EMPTY = re.compile(r'\'args\' must not be empty')
+_ERR_DAEMON_NOT_SEQUENCE = re.compile(r'at daemon: value is not a sequence')
+_ERR_CONFIG_FILE_NOT_EXIST = re.compile(
+    r'User specified config file .* does not exist')
+
+
+def base_valid_config():
+    """Get a fresh, minimal :class:`MLRunnerConfig` that validates."""
+    return MLRunnerConfig(server='http://127.0.0.1:8080',
+                          args=['sh', '-c', 'echo hello'])
+
+
+@pytest.mark.parametrize('field, value, expected', [
+    ('args', ['sh', 123], ['sh', '123']),
+    ('args', 'exit 0', 'exit 0'),
+    ('tags', ['hello', 123], ['hello', '123']),
+    ('env', {'value': 123}, {'value': '123'}),
+    ('gpu', [1, 2], [1, 2]),
+    ('daemon', ['exit 0', ['sh', '-c', 'exit 1']],
+     ['exit 0', ['sh', '-c', 'exit 1']]),
+])
+def test_ml_runner_config_field_conversion(field, value, expected):
+    # each case validates a freshly-built minimal config with just the
+    # field under test set, so a failure pinpoints exactly one conversion
+    config = base_valid_config()
+    config[field] = value
+    assert validate_config(config)[field] == expected
+
 
 class MLRunnerConfigTestCase(unittest.TestCase):
 
@@ -35,23 +71,23 @@ class MLRunnerConfigTestCase(unittest.TestCase):
 
         config.args = 'xyz'
         with pytest.raises(ConfigValidationError,
-                           match='\'server\' is required.'):
+                           match=_ERR_SERVER_REQUIRED):
             _ = validate_config(config)
 
         del config.args
         config.server = 'http://127.0.0.1:8080'
         with pytest.raises(ConfigValidationError,
-                           match='\'args\' is required.'):
+                           match=_ERR_ARGS_REQUIRED):
             _ = validate_config(config)
 
         config.args = ''
         with pytest.raises(ConfigValidationError,
-                           match='\'args\' must not be empty'):
+                           match=_ERR_ARGS_EMPTY):
             _ = validate_config(config)
 
         config.args = []
         with pytest.raises(ConfigValidationError,
-                           match='\'args\' must not be empty'):
+                           match=_ERR_ARGS_EMPTY):
             _ = validate_config(config)
 
         config.args = ['sh', '-c', 'echo hello']
@@ -62,40 +98,21 @@ class MLRunnerConfigTestCase(unittest.TestCase):
         self.assertEqual(config.source.includes, [])
         self.assertEqual(config.source.excludes, [])
 
-        # test .args
-        config = MLRunnerConfig(args=['sh', 123],
-                                server='http://127.0.0.1:8080')
-        self.assertEqual(validate_config(config).args, ['sh', '123'])
-        config = MLRunnerConfig(args='exit 0',
-                                server='http://127.0.0.1:8080')
-        self.assertEqual(validate_config(config).args, 'exit 0')
-
-        # test .tags
-        config.tags = ['hello', 123]
-        self.assertListEqual(validate_config(config).tags, ['hello', '123'])
-
-        # test .env
-        config.env = {'value': 123}
-        self.assertEqual(validate_config(config).env, {'value': '123'})
-
-        # test .gpu
-        config.gpu = [1, 2]
-        self.assertListEqual(validate_config(config).gpu, [1, 2])
-
-        # test .daemon
+        # test .daemon error
+        # (valid field conversions are covered by the parametrized
+        # test_ml_runner_config_field_conversion above)
+        config = base_valid_config()
         config.daemon = 'exit 0'
         with pytest.raises(ConfigValidationError,
-                           match='at daemon: value is not a sequence'):
+                           match=_ERR_DAEMON_NOT_SEQUENCE):
             _ = validate_config(config)
-
-        config.daemon = ['exit 0', ['sh', '-c', 'exit 1']]
-        self.assertListEqual(validate_config(config).daemon, [
-            'exit 0', ['sh', '-c', 'exit 1']
-        ])
+        del config.daemon
 
         # test .source.includes & .source.excludes using literals
+        # (`includes` stays a raw string, to cover the case where a string
+        # gets compiled into a Regex by the validator)
         includes = r'.*\.py$'
-        excludes = re.compile(r'.*/\.svn$')
+        excludes = _SVN_PATTERN
 
         config.source.includes = includes
         config.source.excludes = excludes
@@ -110,8 +127,8 @@ class MLRunnerConfigTestCase(unittest.TestCase):
         self.assertIs(c.source.excludes[0], excludes)
 
         # test .source.includes & .source.excludes using lists
-        includes = [r'.*\.py$', re.compile(r'.*\.exe$')]
-        excludes = [r'.*/\.git$', re.compile(r'.*/\.svn$')]
+        includes = [r'.*\.py$', _EXE_PATTERN]
+        excludes = [r'.*/\.git$', _SVN_PATTERN]
 
         config.source.includes = includes
         config.source.excludes = excludes
@@ -132,103 +149,107 @@ class MLRunnerConfigLoaderTestCase(unittest.TestCase):
 
     maxDiff = None
 
-    def test_loader(self):
-        with TemporaryDirectory() as temp_dir:
-            # prepare for the test dir
-            prepare_dir(temp_dir, {
-                'sys1': {
-                    '.mlrun.yaml': b'clone_from: sys1\n'
-                                   b'args: sys1/.mlrun.yaml args\n'
-                },
-                'sys2': {
-                    '.mlrun.yml': b'args: sys2/.mlrun.yml args\n'
-                                  b'name: sys2/.mlrun.yml',
-                },
-                'work': {
-                    '.mlrun.yml': b'name: work/.mlrun.yml\n'
-                                  b'server: http://127.0.0.1:8080',
-                    '.mlrun.yaml': b'server: http://127.0.0.1:8081\n'
-                                   b'tags: [1, 2, 3]',
-                    '.mlrun.json': b'{"tags": [4, 5, 6],'
-                                   b'"description": "work/.mlrun.json"}',
-                    'nested': {
-                        '.mlrun.yml': b'description: work/nested/.mlrun.yml\n'
-                                      b'resume_from: xyz'
-                    }
-                },
-                'config1.yml': b'resume_from: zyx\n'
-                               b'source.src_dir: config1',
-                'config2.yml': b'source.src_dir: config2\n'
-                               b'logging.log_file: config2.log',
-            })
+    @pytest.fixture(autouse=True)
+    def _tmp_path_factory(self, tmp_path_factory):
+        # allocate sub-directories from pytest's session tmpdir instead of
+        # churning mkdtemp + rmtree inside every test
+        self.tmp_path_factory = tmp_path_factory
 
-            # test loader
-            config = MLRunnerConfig(env={'a': '1'}, clone_from='code')
-            loader = MLRunnerConfigLoader(
-                config=config,
-                config_files=[
-                    os.path.join(temp_dir, 'config1.yml'),
-                    os.path.join(temp_dir, 'config2.yml')
-                ],
-                work_dir=os.path.join(temp_dir, 'work/nested'),
-                system_paths=[
-                    os.path.join(temp_dir, 'sys1'),
-                    os.path.join(temp_dir, 'sys2')
-                ],
-            )
-            expected_config_files = [
-                os.path.join(temp_dir, 'sys1/.mlrun.yaml'),
-                os.path.join(temp_dir, 'sys2/.mlrun.yml'),
-                os.path.join(temp_dir, 'work/.mlrun.yml'),
-                os.path.join(temp_dir, 'work/.mlrun.yaml'),
-                os.path.join(temp_dir, 'work/.mlrun.json'),
-                os.path.join(temp_dir, 'work/nested/.mlrun.yml'),
+    def test_loader(self):
+        temp_dir = str(self.tmp_path_factory.mktemp('loader'))
+        # prepare for the test dir
+        prepare_dir(temp_dir, {
+            'sys1': {
+                '.mlrun.yaml': b'clone_from: sys1\n'
+                               b'args: sys1/.mlrun.yaml args\n'
+            },
+            'sys2': {
+                '.mlrun.yml': b'args: sys2/.mlrun.yml args\n'
+                              b'name: sys2/.mlrun.yml',
+            },
+            'work': {
+                '.mlrun.yml': b'name: work/.mlrun.yml\n'
+                              b'server: http://127.0.0.1:8080',
+                '.mlrun.yaml': b'server: http://127.0.0.1:8081\n'
+                               b'tags: [1, 2, 3]',
+                '.mlrun.json': b'{"tags": [4, 5, 6],'
+                               b'"description": "work/.mlrun.json"}',
+                'nested': {
+                    '.mlrun.yml': b'description: work/nested/.mlrun.yml\n'
+                                  b'resume_from: xyz'
+                }
+            },
+            'config1.yml': b'resume_from: zyx\n'
+                           b'source.src_dir: config1',
+            'config2.yml': b'source.src_dir: config2\n'
+                           b'logging.log_file: config2.log',
+        })
+
+        # test loader
+        config = MLRunnerConfig(env={'a': '1'}, clone_from='code')
+        loader = MLRunnerConfigLoader(
+            config=config,
+            config_files=[
                 os.path.join(temp_dir, 'config1.yml'),
-                os.path.join(temp_dir, 'config2.yml'),
+                os.path.join(temp_dir, 'config2.yml')
+            ],
+            work_dir=os.path.join(temp_dir, 'work/nested'),
+            system_paths=[
+                os.path.join(temp_dir, 'sys1'),
+                os.path.join(temp_dir, 'sys2')
+            ],
+        )
+        expected_config_files = [
+            os.path.join(temp_dir, 'sys1/.mlrun.yaml'),
+            os.path.join(temp_dir, 'sys2/.mlrun.yml'),
+            os.path.join(temp_dir, 'work/.mlrun.yml'),
+            os.path.join(temp_dir, 'work/.mlrun.yaml'),
+            os.path.join(temp_dir, 'work/.mlrun.json'),
+            os.path.join(temp_dir, 'work/nested/.mlrun.yml'),
+            os.path.join(temp_dir, 'config1.yml'),
+            os.path.join(temp_dir, 'config2.yml'),
+        ]
+        assert loader.list_config_files() == expected_config_files
+        load_order = []
+        loader.load_config_files(on_load=load_order.append)
+        assert load_order == expected_config_files
+
+        config = loader.get()
+        self.assertEqual(config.logging.log_file, 'config2.log')
+        self.assertEqual(config.source.src_dir, 'config2')
+        self.assertEqual(config.resume_from, 'zyx')
+        self.assertEqual(config.description, 'work/nested/.mlrun.yml')
+        assert config.tags == ['4', '5', '6']
+        self.assertEqual(config.server, 'http://127.0.0.1:8081')
+        self.assertEqual(config.name, 'work/.mlrun.yml')
+        self.assertEqual(config.args, 'sys2/.mlrun.yml args')
+        self.assertEqual(config.clone_from, 'sys1')
+        self.assertEqual(config.env, {'a': '1'})
+
+        # test bare loader
+        loader = MLRunnerConfigLoader(system_paths=[])
+        assert loader.list_config_files() == []
+        loader.load_config_files()
+
+        # test just one config file
+        cfg_file = os.path.join(temp_dir, 'config.json')
+        write_file_content(cfg_file, b'{"args": "exit 0",'
+                                     b'"server":"http://127.0.0.1:8080"}')
+        loader = MLRunnerConfigLoader(config_files=[cfg_file])
+        loader.load_config_files()
+        self.assertEqual(loader.get(), MLRunnerConfig(
+            server='http://127.0.0.1:8080',
+            args='exit 0'
+        ))
+
+        # test error on non-exist user specified config file
+        loader = MLRunnerConfigLoader(
+            config_files=[
+                os.path.join(temp_dir, 'not-exist.yml')
             ]
-            self.assertListEqual(
-                loader.list_config_files(), expected_config_files)
-            load_order = []
-            loader.load_config_files(on_load=load_order.append)
-            self.assertListEqual(load_order, expected_config_files)
-
-            config = loader.get()
-            self.assertEqual(config.logging.log_file, 'config2.log')
-            self.assertEqual(config.source.src_dir, 'config2')
-            self.assertEqual(config.resume_from, 'zyx')
-            self.assertEqual(config.description, 'work/nested/.mlrun.yml')
-            self.assertListEqual(config.tags, ['4', '5', '6'])
-            self.assertEqual(config.server, 'http://127.0.0.1:8081')
-            self.assertEqual(config.name, 'work/.mlrun.yml')
-            self.assertEqual(config.args, 'sys2/.mlrun.yml args')
-            self.assertEqual(config.clone_from, 'sys1')
-            self.assertEqual(config.env, {'a': '1'})
-
-            # test bare loader
-            loader = MLRunnerConfigLoader(system_paths=[])
-            self.assertListEqual(loader.list_config_files(), [])
-            loader.load_config_files()
-
-            # test just one config file
-            cfg_file = os.path.join(temp_dir, 'config.json')
-            write_file_content(cfg_file, b'{"args": "exit 0",'
-                                         b'"server":"http://127.0.0.1:8080"}')
-            loader = MLRunnerConfigLoader(config_files=[cfg_file])
+        )
+        with pytest.raises(IOError, match=_ERR_CONFIG_FILE_NOT_EXIST):
             loader.load_config_files()
-            self.assertEqual(loader.get(), MLRunnerConfig(
-                server='http://127.0.0.1:8080',
-                args='exit 0'
-            ))
-
-            # test error on non-exist user specified config file
-            loader = MLRunnerConfigLoader(
-                config_files=[
-                    os.path.join(temp_dir, 'not-exist.yml')
-                ]
-            )
-            with pytest.raises(IOError, match='User specified config file '
-                                              '.* does not exist'):
-                loader.load_config_files()
 
 
 class MockMLServer(object):
@@ -346,264 +367,268 @@ class MockMLServer(object):
 
 class MLRunnerTestCase(unittest.TestCase):
 
+    @pytest.fixture(autouse=True)
+    def _tmp_path_factory(self, tmp_path_factory):
+        self.tmp_path_factory = tmp_path_factory
+
     maxDiff = None
 
     @slow_test
     @httpretty.activate
     def test_run(self):
-        with TemporaryDirectory() as temp_dir:
-            # prepare for the source dir
-            source_root = os.path.join(temp_dir, 'source')
-            source_fiels = {
-                'a.py': b'print("a.py")\n',
-                'a.txt': b'a.txt content\n',
-                'nested': {
-                    'b.sh': b'echo "b.sh"\n'
-                }
+        temp_dir = str(self.tmp_path_factory.mktemp('runner'))
+        # prepare for the source dir
+        source_root = os.path.join(temp_dir, 'source')
+        source_fiels = {
+            'a.py': b'print("a.py")\n',
+            'a.txt': b'a.txt content\n',
+            'nested': {
+                'b.sh': b'echo "b.sh"\n'
             }
-            prepare_dir(source_root, source_fiels)
+        }
+        prepare_dir(source_root, source_fiels)
 
-            with chdir_context(source_root):
-                # prepare for the test server
-                output_root = os.path.join(temp_dir, 'output')
-                server = MockMLServer(output_root)
+        with chdir_context(source_root):
+            # prepare for the test server
+            output_root = os.path.join(temp_dir, 'output')
+            server = MockMLServer(output_root)
 
-                # prepare for the test experiment runner
-                config = MLRunnerConfig(
-                    server=server.uri,
-                    name='test',
-                    args=[
-                        'python',
-                        '-c',
-                        'print("hello")\n'
-                        'print("[Epoch 2/5, Batch 3/6, Step 4, ETA 5s] epoch_time: 1s; loss: 0.25 (±0.1); span: 5")\n'
-                        'open("config.json", "wb").write(b"{\\"max_epoch\\": 123}\\n")\n'
-                        'open("config.defaults.json", "wb").write(b"{\\"max_epoch\\": 100}\\n")\n'
-                        'open("webui.json", "wb").write(b"{\\"TB\\": \\"http://tb:7890\\"}\\n")\n'
-                        'import time\n'
-                        'time.sleep(1)\n'
-                        'open("result.json", "wb").write(b"{\\"acc\\": 0.99}\\n")\n'
-                    ],
-                    daemon=[
-                        ['echo', 'daemon 1'],
-                        'echo "Serving HTTP on 0.0.0.0 port 12367 '
-                        '(http://0.0.0.0:12367/)"',
-                        'env',
-                    ],
-                    env={'MY_ENV': 'abc'},
-                    gpu=[1, 2]
-                )
-                config.source.copy_to_dst = True
-                config.source.cleanup = False
-                runner = MLRunner(config, retry_intervals=(0.1, 0.2, 0.3))
+            # prepare for the test experiment runner
+            config = MLRunnerConfig(
+                server=server.uri,
+                name='test',
+                args=[
+                    'python',
+                    '-c',
+                    'print("hello")\n'
+                    'print("[Epoch 2/5, Batch 3/6, Step 4, ETA 5s] epoch_time: 1s; loss: 0.25 (±0.1); span: 5")\n'
+                    'open("config.json", "wb").write(b"{\\"max_epoch\\": 123}\\n")\n'
+                    'open("config.defaults.json", "wb").write(b"{\\"max_epoch\\": 100}\\n")\n'
+                    'open("webui.json", "wb").write(b"{\\"TB\\": \\"http://tb:7890\\"}\\n")\n'
+                    'import time\n'
+                    'time.sleep(1)\n'
+                    'open("result.json", "wb").write(b"{\\"acc\\": 0.99}\\n")\n'
+                ],
+                daemon=[
+                    ['echo', 'daemon 1'],
+                    'echo "Serving HTTP on 0.0.0.0 port 12367 '
+                    '(http://0.0.0.0:12367/)"',
+                    'env',
+                ],
+                env={'MY_ENV': 'abc'},
+                gpu=[1, 2]
+            )
+            config.source.copy_to_dst = True
+            config.source.cleanup = False
+            runner = MLRunner(config, retry_intervals=(0.1, 0.2, 0.3))
 
-                # run the test experiment
-                with server:
-                    code = runner.run()
-                    self.assertEqual(code, 0)
+            # run the test experiment
+            with server:
+                code = runner.run()
+                self.assertEqual(code, 0)
 
-                # check the result
-                self.assertEqual(len(server.db), 1)
-                doc = list(server.db.values())[0]
+            # check the result
+            self.assertEqual(len(server.db), 1)
+            doc = list(server.db.values())[0]
 
-                output_dir = os.path.join(output_root, doc['_id'])
-                size, inode = compute_fs_size_and_inode(output_dir)
-
-                exc_info = doc.pop('exc_info')
-                self.assertIsInstance(exc_info, dict)
-                self.assertEqual(exc_info['hostname'], socket.gethostname())
-                self.assertIsInstance(exc_info['pid'], int)
-                self.assertIsInstance(exc_info['env'], dict)
-                self.assertEqual(exc_info['env']['PYTHONUNBUFFERED'], '1')
-                self.assertEqual(exc_info['env']['MLSTORAGE_SERVER_URI'],
-                                 'http://127.0.0.1:8080')
-                self.assertEqual(exc_info['env']['MLSTORAGE_EXPERIMENT_ID'],
-                                 doc['_id'])
-                self.assertEqual(exc_info['env']['MLSTORAGE_OUTPUT_DIR'],
-                                 output_dir)
-                self.assertEqual(exc_info['env']['PWD'], output_dir)
-                self.assertEqual(exc_info['env']['CUDA_VISIBLE_DEVICES'], '1,2')
-                self.assertIn(output_dir, exc_info['env']['PYTHONPATH'])
-                self.assertIn(source_root, exc_info['env']['PYTHONPATH'])
-
-                control_port = doc.pop('control_port')
-                self.assertIsInstance(control_port, dict)
-                self.assertTrue(control_port['kill'].startswith('http://'))
-
-                hostname = socket.gethostname()
-                stop_time = doc.pop('stop_time')
-                self.assertEqual(doc.pop('heartbeat'), stop_time)
-                self.assertDictEqual(doc, {
-                    'name': config.name,
-                    '_id': doc["_id"],
-                    'storage_dir': os.path.join(
-                        temp_dir, f'output/{doc["_id"]}'),
-                    'args': config.args,
-                    'progress': {'epoch': '2/5', 'batch': '3/6', 'step': 4, 'eta': '5s'},
-                    'result': {'acc': 0.99, 'span': '5', 'loss': '0.25 (±0.1)'},
-                    'exit_code': code,
-                    'storage_size': size,
-                    'storage_inode': inode,
-                    'status': 'COMPLETED',
-                    'config': {'max_epoch': 123},
-                    'default_config': {'max_epoch': 100},
-                    'webui': {'SimpleHTTP': f'http://{hostname}:12367/',
-                              'TB': 'http://tb:7890'},
-                })
+            output_dir = os.path.join(output_root, doc['_id'])
+            size, inode = compute_fs_size_and_inode(output_dir)
+
+            exc_info = doc.pop('exc_info')
+            self.assertIsInstance(exc_info, dict)
+            self.assertEqual(exc_info['hostname'], socket.gethostname())
+            self.assertIsInstance(exc_info['pid'], int)
+            self.assertIsInstance(exc_info['env'], dict)
+            self.assertEqual(exc_info['env']['PYTHONUNBUFFERED'], '1')
+            self.assertEqual(exc_info['env']['MLSTORAGE_SERVER_URI'],
+                             'http://127.0.0.1:8080')
+            self.assertEqual(exc_info['env']['MLSTORAGE_EXPERIMENT_ID'],
+                             doc['_id'])
+            self.assertEqual(exc_info['env']['MLSTORAGE_OUTPUT_DIR'],
+                             output_dir)
+            self.assertEqual(exc_info['env']['PWD'], output_dir)
+            self.assertEqual(exc_info['env']['CUDA_VISIBLE_DEVICES'], '1,2')
+            self.assertIn(output_dir, exc_info['env']['PYTHONPATH'])
+            self.assertIn(source_root, exc_info['env']['PYTHONPATH'])
+
+            control_port = doc.pop('control_port')
+            self.assertIsInstance(control_port, dict)
+            self.assertTrue(control_port['kill'].startswith('http://'))
+
+            hostname = socket.gethostname()
+            stop_time = doc.pop('stop_time')
+            self.assertEqual(doc.pop('heartbeat'), stop_time)
+            self.assertDictEqual(doc, {
+                'name': config.name,
+                '_id': doc["_id"],
+                'storage_dir': os.path.join(
+                    temp_dir, f'output/{doc["_id"]}'),
+                'args': config.args,
+                'progress': {'epoch': '2/5', 'batch': '3/6', 'step': 4, 'eta': '5s'},
+                'result': {'acc': 0.99, 'span': '5', 'loss': '0.25 (±0.1)'},
+                'exit_code': code,
+                'storage_size': size,
+                'storage_inode': inode,
+                'status': 'COMPLETED',
+                'config': {'max_epoch': 123},
+                'default_config': {'max_epoch': 100},
+                'webui': {'SimpleHTTP': f'http://{hostname}:12367/',
+                          'TB': 'http://tb:7890'},
+            })
 
-                output_snapshot = dir_snapshot(output_dir)
-                self.assertEqual(
-                    set(output_snapshot),
-                    {'config.defaults.json', 'config.json', 'console.log',
-                     'daemon.0.log', 'daemon.1.log', 'daemon.2.log',
-                     'mlrun.log', 'result.json', 'webui.json', 'source.zip',
-                     'a.py', 'nested'}
-                )
+            output_snapshot = dir_snapshot(output_dir)
+            self.assertEqual(
+                set(output_snapshot),
+                {'config.defaults.json', 'config.json', 'console.log',
+                 'daemon.0.log', 'daemon.1.log', 'daemon.2.log',
+                 'mlrun.log', 'result.json', 'webui.json', 'source.zip',
+                 'a.py', 'nested'}
+            )
 
-                self.assertEqual(output_snapshot['config.defaults.json'],
-                                 b'{"max_epoch": 100}\n')
-                self.assertEqual(output_snapshot['config.json'],
-                                 b'{"max_epoch": 123}\n')
-                self.assertEqual(output_snapshot['console.log'],
-                                 b'hello\n'
-                                 b'[Epoch 2/5, Batch 3/6, Step 4, ETA 5s] '
-                                 b'epoch_time: 1s; loss: 0.25 (\xc2\xb10.1); '
-                                 b'span: 5\n')
-                self.assertEqual(output_snapshot['result.json'],
-                                 b'{"acc": 0.99}\n')
-                self.assertEqual(output_snapshot['webui.json'],
-                                 b'{"TB": "http://tb:7890"}\n')
+            self.assertEqual(output_snapshot['config.defaults.json'],
+                             b'{"max_epoch": 100}\n')
+            self.assertEqual(output_snapshot['config.json'],
+                             b'{"max_epoch": 123}\n')
+            self.assertEqual(output_snapshot['console.log'],
+                             b'hello\n'
+                             b'[Epoch 2/5, Batch 3/6, Step 4, ETA 5s] '
+                             b'epoch_time: 1s; loss: 0.25 (\xc2\xb10.1); '
+                             b'span: 5\n')
+            self.assertEqual(output_snapshot['result.json'],
+                             b'{"acc": 0.99}\n')
+            self.assertEqual(output_snapshot['webui.json'],
+                             b'{"TB": "http://tb:7890"}\n')
+
+            self.assertEqual(output_snapshot['daemon.0.log'],
+                             b'daemon 1\n')
+            self.assertTrue(output_snapshot['daemon.1.log'].startswith(
+                b'Serving HTTP on 0.0.0.0 port 12367 '
+                b'(http://0.0.0.0:12367/)'
+            ))
 
-                self.assertEqual(output_snapshot['daemon.0.log'],
-                                 b'daemon 1\n')
-                self.assertTrue(output_snapshot['daemon.1.log'].startswith(
-                    b'Serving HTTP on 0.0.0.0 port 12367 '
-                    b'(http://0.0.0.0:12367/)'
-                ))
-
-                self.assertIn(b'MY_ENV=abc\n', output_snapshot['daemon.2.log'])
-                self.assertIn(b'PYTHONUNBUFFERED=1\n',
-                              output_snapshot['daemon.2.log'])
-
-                self.assertEqual(output_snapshot['a.py'], b'print("a.py")\n')
-                self.assertDictEqual(output_snapshot['nested'], {
-                    'b.sh': b'echo "b.sh"\n',
-                })
+            self.assertIn(b'MY_ENV=abc\n', output_snapshot['daemon.2.log'])
+            self.assertIn(b'PYTHONUNBUFFERED=1\n',
+                          output_snapshot['daemon.2.log'])
+
+            self.assertEqual(output_snapshot['a.py'], b'print("a.py")\n')
+            self.assertDictEqual(output_snapshot['nested'], {
+                'b.sh': b'echo "b.sh"\n',
+            })
 
-                self.assertDictEqual(
-                    zip_snapshot(os.path.join(output_dir, 'source.zip')),
-                    {
-                        'a.py': b'print("a.py")\n',
-                        'nested': {
-                            'b.sh': b'echo "b.sh"\n'
-                        }
+            self.assertDictEqual(
+                zip_snapshot(os.path.join(output_dir, 'source.zip')),
+                {
+                    'a.py': b'print("a.py")\n',
+                    'nested': {
+                        'b.sh': b'echo "b.sh"\n'
                     }
-                )
+                }
+            )
 
     @slow_test
     @httpretty.activate
     def test_copy_arg_files_resume_and_clone(self):
         parent_id = str(ObjectId())
 
-        with TemporaryDirectory() as temp_dir:
-            # prepare for the source dir
-            source_root = os.path.join(temp_dir, 'source')
-            source_fiels = {
-                'a.py': b'print("a.py")\n',
-                'a.txt': b'a.txt content\n',
-                'nested': {
-                    'b.sh': b'echo "b.sh"\nexit 1\n'
-                }
+        temp_dir = str(self.tmp_path_factory.mktemp('runner'))
+        # prepare for the source dir
+        source_root = os.path.join(temp_dir, 'source')
+        source_fiels = {
+            'a.py': b'print("a.py")\n',
+            'a.txt': b'a.txt content\n',
+            'nested': {
+                'b.sh': b'echo "b.sh"\nexit 1\n'
             }
-            prepare_dir(source_root, source_fiels)
+        }
+        prepare_dir(source_root, source_fiels)
 
-            with chdir_context(source_root):
-                # prepare for the test server
-                output_root = os.path.join(temp_dir, 'output')
-                server = MockMLServer(output_root)
-
-                # test copy arg files
-                config = MLRunnerConfig(
-                    server=server.uri,
-                    args='sh nested/b.sh a.txt'.split(' '),
-                    parent_id=parent_id,
-                )
-                config.source.make_archive = False  # test no source archive
-                runner = MLRunner(config, retry_intervals=(0.1, 0.2, 0.3))
+        with chdir_context(source_root):
+            # prepare for the test server
+            output_root = os.path.join(temp_dir, 'output')
+            server = MockMLServer(output_root)
 
-                with server:
-                    code = runner.run()
-                    self.assertEqual(code, 1)
+            # test copy arg files
+            config = MLRunnerConfig(
+                server=server.uri,
+                args='sh nested/b.sh a.txt'.split(' '),
+                parent_id=parent_id,
+            )
+            config.source.make_archive = False  # test no source archive
+            runner = MLRunner(config, retry_intervals=(0.1, 0.2, 0.3))
 
-                self.assertEqual(len(server.db), 1)
-                doc = list(server.db.values())[0]
-                self.assertEqual(doc['exit_code'], 1)
-                self.assertEqual(doc['status'], 'COMPLETED')
-                self.assertEqual(doc['parent_id'], parent_id)
-                self.assertEqual(doc['name'], ' '.join(config.args))
+            with server:
+                code = runner.run()
+                self.assertEqual(code, 1)
 
-                output_snapshot = dir_snapshot(doc['storage_dir'])
-                self.assertEqual(output_snapshot['console.log'], b'b.sh\n')
-                self.assertEqual(output_snapshot['nested'], {
-                    'b.sh': b'echo "b.sh"\nexit 1\n',
-                })
-                self.assertNotIn('source.zip', output_snapshot)
-                self.assertNotIn('a.txt', output_snapshot)
-                self.assertNotIn('a.py', output_snapshot)
+            self.assertEqual(len(server.db), 1)
+            doc = list(server.db.values())[0]
+            self.assertEqual(doc['exit_code'], 1)
+            self.assertEqual(doc['status'], 'COMPLETED')
+            self.assertEqual(doc['parent_id'], parent_id)
+            self.assertEqual(doc['name'], ' '.join(config.args))
+
+            output_snapshot = dir_snapshot(doc['storage_dir'])
+            self.assertEqual(output_snapshot['console.log'], b'b.sh\n')
+            self.assertEqual(output_snapshot['nested'], {
+                'b.sh': b'echo "b.sh"\nexit 1\n',
+            })
+            self.assertNotIn('source.zip', output_snapshot)
+            self.assertNotIn('a.txt', output_snapshot)
+            self.assertNotIn('a.py', output_snapshot)
 
-                # test resume from
-                config = MLRunnerConfig(
-                    server=server.uri,
-                    args='echo hello',
-                    resume_from=doc['_id'],
-                )
-                config.source.make_archive = False
-                runner = MLRunner(config, retry_intervals=(0.1, 0.2, 0.3))
+            # test resume from
+            config = MLRunnerConfig(
+                server=server.uri,
+                args='echo hello',
+                resume_from=doc['_id'],
+            )
+            config.source.make_archive = False
+            runner = MLRunner(config, retry_intervals=(0.1, 0.2, 0.3))
 
-                with server:
-                    code = runner.run()
-                    self.assertEqual(code, 0)
+            with server:
+                code = runner.run()
+                self.assertEqual(code, 0)
 
-                self.assertEqual(len(server.db), 1)
-                doc2 = list(server.db.values())[0]
-                self.assertEqual(doc2, doc)
+            self.assertEqual(len(server.db), 1)
+            doc2 = list(server.db.values())[0]
+            self.assertEqual(doc2, doc)
 
-                output_snapshot = dir_snapshot(doc['storage_dir'])
-                self.assertEqual(output_snapshot['console.log'],
-                                 b'b.sh\nhello\n')
+            output_snapshot = dir_snapshot(doc['storage_dir'])
+            self.assertEqual(output_snapshot['console.log'],
+                             b'b.sh\nhello\n')
 
-                # test clone from
-                config = MLRunnerConfig(
-                    server=server.uri,
-                    args='echo hi',
-                    clone_from=doc['_id'],
-                )
-                config.source.make_archive = False
-                runner = MLRunner(config, retry_intervals=(0.1, 0.2, 0.3))
+            # test clone from
+            config = MLRunnerConfig(
+                server=server.uri,
+                args='echo hi',
+                clone_from=doc['_id'],
+            )
+            config.source.make_archive = False
+            runner = MLRunner(config, retry_intervals=(0.1, 0.2, 0.3))
 
-                with server:
-                    code = runner.run()
-                    self.assertEqual(code, 0)
+            with server:
+                code = runner.run()
+                self.assertEqual(code, 0)
 
-                self.assertEqual(len(server.db), 2)
-                doc3 = list(server.db.values())[1]
-                self.assertNotEqual(doc3['_id'], doc['_id'])
-                self.assertNotEqual(doc3['storage_dir'], doc['storage_dir'])
+            self.assertEqual(len(server.db), 2)
+            doc3 = list(server.db.values())[1]
+            self.assertNotEqual(doc3['_id'], doc['_id'])
+            self.assertNotEqual(doc3['storage_dir'], doc['storage_dir'])
 
-                output_snapshot = dir_snapshot(doc3['storage_dir'])
-                self.assertEqual(output_snapshot['console.log'],
-                                 b'b.sh\nhello\nhi\n')
-                self.assertEqual(output_snapshot['nested'], {
-                    'b.sh': b'echo "b.sh"\nexit 1\n',
-                })
+            output_snapshot = dir_snapshot(doc3['storage_dir'])
+            self.assertEqual(output_snapshot['console.log'],
+                             b'b.sh\nhello\nhi\n')
+            self.assertEqual(output_snapshot['nested'], {
+                'b.sh': b'echo "b.sh"\nexit 1\n',
+            })
 
     @slow_test
     @httpretty.activate
     def test_work_dir(self):
         parent_id = str(ObjectId())
 
-        with TemporaryDirectory() as temp_dir, \
-                set_environ_context(MLSTORAGE_EXPERIMENT_ID=parent_id):
+        temp_dir = str(self.tmp_path_factory.mktemp('runner'))
+        with set_environ_context(MLSTORAGE_EXPERIMENT_ID=parent_id):
             # prepare for the source dir
             source_root = os.path.join(temp_dir, 'source')
             source_fiels = {
@@ -669,8 +694,8 @@ class MLRunnerTestCase(unittest.TestCase):
         def mock_gethostname():
             raise RuntimeError('cannot get hostname')
 
-        with TemporaryDirectory() as temp_dir, \
-                mock.patch('socket.gethostname', mock_gethostname):
+        temp_dir = str(self.tmp_path_factory.mktemp('runner'))
+        with mock.patch('socket.gethostname', mock_gethostname):
             # prepare for the test server
             output_root = os.path.join(temp_dir, 'output')
             server = MockMLServer(output_root)
@@ -707,8 +732,8 @@ class MLRunnerTestCase(unittest.TestCase):
             raise RuntimeError('cannot configure logger')
             yield
 
-        with TemporaryDirectory() as temp_dir, \
-                mock.patch('mltk.mlrunner.configure_logger',
+        temp_dir = str(self.tmp_path_factory.mktemp('runner'))
+        with mock.patch('mltk.mlrunner.configure_logger',
                            mock_configure_logger):
             # prepare for the test server
             output_root = os.path.join(temp_dir, 'output')
@@ -764,114 +789,147 @@ class PatchedMLRunnerConfigLoader(MLRunnerConfigLoader):
 
 class MLRunTestCase(unittest.TestCase):
 
+    @pytest.fixture(autouse=True)
+    def _tmp_path_factory(self, tmp_path_factory):
+        self.tmp_path_factory = tmp_path_factory
+
     @mock.patch('mltk.mlrunner.MLRunner', PatchedMLRunner)
     @mock.patch('mltk.mlrunner.MLRunnerConfigLoader',
                 PatchedMLRunnerConfigLoader)
     def test_mlrun(self):
-        with TemporaryDirectory() as temp_dir:
-            config1 = os.path.join(temp_dir, 'config1.yml')
-            config2 = os.path.join(temp_dir, 'config2.yml')
-            write_file_content(config1, b'')
-            write_file_content(config2, b'')
-
-            runner = CliRunner()
+        temp_dir = str(self.tmp_path_factory.mktemp('mlrun'))
+        config1 = os.path.join(temp_dir, 'config1.yml')
+        config2 = os.path.join(temp_dir, 'config2.yml')
+        write_file_content(config1, b'')
+        write_file_content(config2, b'')
+
+        runner = CliRunner()
+
+        # test default arguments
+        result = runner.invoke(mlrun, [
+            '-s', 'http://127.0.0.1:8080', '--', 'echo', 'hello'])
+        self.assertEqual(result.exit_code, 0)
+        config = PatchedMLRunner.last_instance.config
+        self.assertEqual(config, MLRunnerConfig(
+            server='http://127.0.0.1:8080',
+            args=['echo', 'hello'],
+            source=MLRunnerConfig.source(
+                copy_to_dst=False,
+                make_archive=True,
+            ),
+            integration=MLRunnerConfig.integration(
+                parse_stdout=True
+            )
+        ))
 
-            # test default arguments
+        # test various arguments
+        with set_environ_context(
+                MLSTORAGE_SERVER_URI='http://127.0.0.1:8080'):
             result = runner.invoke(mlrun, [
-                '-s', 'http://127.0.0.1:8080', '--', 'echo', 'hello'])
+                '-C', config1,
+                '--config-file=' + config2,
+                '-c', 'echo hello',
+                '-e', 'MY_ENV=abc',
+                '--env=MY_ENV2=def',
+                '-g', '1,2',
+                '--gpu=3',
+                '-n', 'test',
+                '--description=testing',
+                '-t', 'first',
+                '--tags=second',
+                '--daemon=echo hello',
+                '-D', 'echo hi',
+                '--tensorboard',
+                '--no-source-archive',
+                '--no-parse-stdout',
+                '--copy-source',
+                '--resume-from=xyzz',
+                '--clone-from=zyxx',
+            ])
             self.assertEqual(result.exit_code, 0)
             config = PatchedMLRunner.last_instance.config
             self.assertEqual(config, MLRunnerConfig(
                 server='http://127.0.0.1:8080',
-                args=['echo', 'hello'],
+                args='echo hello',
+                env={'MY_ENV': 'abc', 'MY_ENV2': 'def'},
+                gpu=[1, 2, 3],
+                name='test',
+                description='testing',
+                tags=['first', 'second'],
+                daemon=[
+                    'echo hello',
+                    'echo hi',
+                    'tensorboard --logdir=. --port=0',
+                ],
                 source=MLRunnerConfig.source(
-                    copy_to_dst=False,
-                    make_archive=True,
+                    copy_to_dst=True,
+                    make_archive=False,
                 ),
                 integration=MLRunnerConfig.integration(
-                    parse_stdout=True
-                )
+                    parse_stdout=False
+                ),
+                resume_from='xyzz',
+                clone_from='zyxx',
             ))
-
-            # test various arguments
-            with set_environ_context(
-                    MLSTORAGE_SERVER_URI='http://127.0.0.1:8080'):
-                result = runner.invoke(mlrun, [
-                    '-C', config1,
-                    '--config-file=' + config2,
-                    '-c', 'echo hello',
-                    '-e', 'MY_ENV=abc',
-                    '--env=MY_ENV2=def',
-                    '-g', '1,2',
-                    '--gpu=3',
-                    '-n', 'test',
-                    '--description=testing',
-                    '-t', 'first',
-                    '--tags=second',
-                    '--daemon=echo hello',
-                    '-D', 'echo hi',
-                    '--tensorboard',
-                    '--no-source-archive',
-                    '--no-parse-stdout',
-                    '--copy-source',
-                    '--resume-from=xyzz',
-                    '--clone-from=zyxx',
-                ])
-                self.assertEqual(result.exit_code, 0)
-                config = PatchedMLRunner.last_instance.config
-                self.assertEqual(config, MLRunnerConfig(
-                    server='http://127.0.0.1:8080',
-                    args='echo hello',
-                    env={'MY_ENV': 'abc', 'MY_ENV2': 'def'},
-                    gpu=[1, 2, 3],
-                    name='test',
-                    description='testing',
-                    tags=['first', 'second'],
-                    daemon=[
-                        'echo hello',
-                        'echo hi',
-                        'tensorboard --logdir=. --port=0',
-                    ],
-                    source=MLRunnerConfig.source(
-                        copy_to_dst=True,
-                        make_archive=False,
-                    ),
-                    integration=MLRunnerConfig.integration(
-                        parse_stdout=False
-                    ),
-                    resume_from='xyzz',
-                    clone_from='zyxx',
-                ))
-                config_loader = PatchedMLRunnerConfigLoader.last_instance
-                self.assertEqual(config_loader._user_config_files,
-                                 (config1, config2))
-                self.assertTrue(config_loader.loaded)
-
-            # test None exit code
-            PatchedMLRunner.exit_code = None
-            result = runner.invoke(mlrun, [
-                '-s', 'http://127.0.0.1:8080', '--', 'echo', 'hello'])
-            self.assertEqual(result.exit_code, -1)
+            config_loader = PatchedMLRunnerConfigLoader.last_instance
+            self.assertEqual(config_loader._user_config_files,
+                             (config1, config2))
+            self.assertTrue(config_loader.loaded)
+
+        # test None exit code
+        PatchedMLRunner.exit_code = None
+        result = runner.invoke(mlrun, [
+            '-s', 'http://127.0.0.1:8080', '--', 'echo', 'hello'])
+        self.assertEqual(result.exit_code, -1)
+
+
+@pytest.fixture(scope='session')
+def two_chunk_script(tmp_path_factory):
+    """
+    Export a script that writes "hello\\n", waits for the barrier file
+    given as its first argument to appear, then writes "world\\n".
+
+    The barrier guarantees that the parent consumes the two writes as two
+    separate chunks, without sleeping for a fixed amount of time.  The
+    script is written once per session, so both log-parser tests reuse
+    the same file instead of compiling a fresh ``-c`` snippet.
+    """
+    path = str(tmp_path_factory.mktemp('program_host') / 'two_chunk.py')
+    write_file_content(
+        path,
+        b'import os, sys, time\n'
+        b'sys.stdout.write("hello\\n")\n'
+        b'sys.stdout.flush()\n'
+        b'while not os.path.exists(sys.argv[1]):\n'
+        b'    time.sleep(0.001)\n'
+        b'sys.stdout.write("world\\n")\n'
+    )
+    return path
 
 
 class ProgramHostTestCase(unittest.TestCase):
 
-    @slow_test
-    def test_run(self):
-        def run_and_get_output(*args, **kwargs):
-            with TemporaryDirectory() as temp_dir:
-                log_file = os.path.join(temp_dir, 'log.txt')
-                kwargs.setdefault('log_to_stdout', False)
-                kwargs.setdefault('log_file', log_file)
-                host = ProgramHost(*args, **kwargs)
-                code = host.run()
-                if os.path.isfile(log_file):
-                    output = get_file_content(log_file)
-                else:
-                    output = None
-                return code, output
-
-        # test exit code
+    @pytest.fixture(autouse=True)
+    def _tmp_path_factory(self, tmp_path_factory, two_chunk_script,
+                          capfdbinary):
+        self.tmp_path_factory = tmp_path_factory
+        self.two_chunk_script = two_chunk_script
+        self.capfdbinary = capfdbinary
+
+    def run_and_get_output(self, *args, **kwargs):
+        temp_dir = str(self.tmp_path_factory.mktemp('program_host'))
+        log_file = os.path.join(temp_dir, 'log.txt')
+        kwargs.setdefault('log_to_stdout', False)
+        kwargs.setdefault('log_file', log_file)
+        host = ProgramHost(*args, **kwargs)
+        code = host.run()
+        if os.path.isfile(log_file):
+            output = get_file_content(log_file)
+        else:
+            output = None
+        return code, output
+
+    def test_run_exit_code(self):
         host = ProgramHost('exit 123', log_to_stdout=False)
         self.assertEqual(host.run(), 123)
 
@@ -879,49 +937,39 @@ class ProgramHostTestCase(unittest.TestCase):
                            log_to_stdout=False)
         self.assertEqual(host.run(), 123)
 
-        # test environment dict
-        code, output = run_and_get_output(
-            'env',
+    def test_run_env_dict(self):
+        # echo just the two variables rather than dumping (and scanning)
+        # the whole inherited environment
+        code, output = self.run_and_get_output(
+            'echo "$MY_ENV_VAR|$MY_ENV_VAR_2"',
             env={
                 'MY_ENV_VAR': 'hello',
                 b'MY_ENV_VAR_2': b'hi',
             },
         )
         self.assertEqual(code, 0)
-        self.assertIn(b'MY_ENV_VAR=hello\n', output)
-        self.assertIn(b'MY_ENV_VAR_2=hi\n', output)
+        self.assertEqual(output, b'hello|hi\n')
+
+    def test_run_work_dir(self):
+        temp_dir = str(self.tmp_path_factory.mktemp('program_host'))
+        temp_dir = os.path.realpath(temp_dir)
+        code, output = self.run_and_get_output('pwd', work_dir=temp_dir)
+        self.assertEqual(code, 0)
+        self.assertEqual(output, temp_dir.encode('utf-8') + b'\n')
+
+    def test_run_stdout_redirect(self):
+        # pytest's fd-level capture already redirects the stdout fileno,
+        # so no manual dup/dup2 shuffle is required here
+        code, output = self.run_and_get_output(
+            'echo "hello"', log_to_stdout=True)
+        self.assertEqual(code, 0)
+        self.assertEqual(output, b'hello\n')
+        self.assertEqual(self.capfdbinary.readouterr().out, b'hello\n')
+
+    def test_run_log_parser(self):
+        barrier_file = os.path.join(
+            str(self.tmp_path_factory.mktemp('program_host')), 'barrier')
 
-        # test work dir
-        with TemporaryDirectory() as temp_dir:
-            temp_dir = os.path.realpath(temp_dir)
-            code, output = run_and_get_output('pwd', work_dir=temp_dir)
-            self.assertEqual(code, 0)
-            self.assertEqual(output, temp_dir.encode('utf-8') + b'\n')
-
-        # test stdout
-        with TemporaryDirectory() as temp_dir:
-            log_file = os.path.join(temp_dir, 'log.txt')
-            fd = os.open(log_file, os.O_CREAT | os.O_WRONLY | os.O_TRUNC)
-            stdout_fd = sys.stdout.fileno()
-            stdout_fd2 = None
-
-            try:
-                sys.stdout.flush()
-                stdout_fd2 = os.dup(stdout_fd)
-                os.dup2(fd, stdout_fd)
-
-                # run the program
-                code, output = run_and_get_output(
-                    'echo "hello"', log_to_stdout=True)
-                self.assertEqual(code, 0)
-                self.assertEqual(output, b'hello\n')
-                self.assertEqual(get_file_content(log_file), output)
-            finally:
-                if stdout_fd2 is not None:
-                    os.dup2(stdout_fd2, stdout_fd)
-                    os.close(stdout_fd2)
-
-        # test log parser
         class MyParser(ProgramOutputReceiver):
             def __init__(self):
                 super().__init__([])
@@ -932,28 +980,26 @@ class ProgramHostTestCase(unittest.TestCase):
 
             def put_output(self, data: bytes):
                 logs.append(data)
+                # unblock the program once this chunk has been consumed
+                write_file_content(barrier_file, b'')
 
             def stop(self):
                 super().stop()
                 logs.append('flush')
 
         logs = []
-        code, output = run_and_get_output(
-            [
-                r'python', '-c',
-                r'import sys, time; '
-                r'sys.stdout.write("hello\n"); '
-                r'sys.stdout.flush(); '
-                r'time.sleep(0.1); '
-                r'sys.stdout.write("world\n")'
-            ],
+        code, output = self.run_and_get_output(
+            ['python', self.two_chunk_script, barrier_file],
             log_receiver=MyParser()
         )
         self.assertEqual(code, 0)
         self.assertEqual(output, b'hello\nworld\n')
-        self.assertListEqual(logs, ['start', b'hello\n', b'world\n', 'flush'])
+        assert logs == ['start', b'hello\n', b'world\n', 'flush']
+
+    def test_run_log_parser_error(self):
+        barrier_file = os.path.join(
+            str(self.tmp_path_factory.mktemp('program_host')), 'barrier')
 
-        # test log parser with error
         class MyParser(ProgramOutputReceiver):
             def __init__(self):
                 super().__init__([])
@@ -964,6 +1010,7 @@ class ProgramHostTestCase(unittest.TestCase):
 
             def put_output(self, content: bytes):
                 logs.append(content)
+                write_file_content(barrier_file, b'')
                 raise RuntimeError('some error occurred')
 
             def stop(self):
@@ -972,322 +1019,369 @@ class ProgramHostTestCase(unittest.TestCase):
                 raise RuntimeError('some error occurred')
 
         logs = []
-        code, output = run_and_get_output(
-            [
-                r'python', '-c',
-                r'import sys, time; '
-                r'sys.stdout.write("hello\n"); '
-                r'sys.stdout.flush(); '
-                r'time.sleep(0.1); '
-                r'sys.stdout.write("world\n")'
-            ],
+        code, output = self.run_and_get_output(
+            ['python', self.two_chunk_script, barrier_file],
             log_receiver=MyParser()
         )
         self.assertEqual(code, 0)
         self.assertEqual(output, b'hello\nworld\n')
-        self.assertListEqual(logs, ['start', b'hello\n', b'world\n', 'flush'])
+        assert logs == ['start', b'hello\n', b'world\n', 'flush']
 
-        # test log file
-        with TemporaryDirectory() as temp_dir:
-            log_file = os.path.join(temp_dir, 'log.txt')
+    def test_run_log_file(self):
+        temp_dir = str(self.tmp_path_factory.mktemp('program_host'))
+        log_file = os.path.join(temp_dir, 'log.txt')
 
-            # test append
-            code, output = run_and_get_output('echo hello', log_file=log_file)
-            self.assertEqual(code, 0)
-            code, output = run_and_get_output('echo hi', log_file=log_file)
-            self.assertEqual(code, 0)
-            self.assertEqual(get_file_content(log_file), b'hello\nhi\n')
+        # test append: seed the log file directly instead of spending a
+        # subprocess launch just to produce the pre-existing content
+        write_file_content(log_file, b'hello\n')
+        code, output = self.run_and_get_output('echo hi', log_file=log_file)
+        self.assertEqual(code, 0)
+        self.assertEqual(get_file_content(log_file), b'hello\nhi\n')
 
-            # test no append
-            code, output = run_and_get_output(
-                'echo hey', log_file=log_file, append_to_file=False)
+        # test no append
+        code, output = self.run_and_get_output(
+            'echo hey', log_file=log_file, append_to_file=False)
+        self.assertEqual(code, 0)
+        self.assertEqual(get_file_content(log_file), b'hey\n')
+
+        # test fileno
+        log_fileno = os.open(
+            log_file, os.O_CREAT | os.O_TRUNC | os.O_WRONLY)
+        try:
+            code, output = self.run_and_get_output(
+                'echo goodbye', log_file=log_fileno)
             self.assertEqual(code, 0)
-            self.assertEqual(get_file_content(log_file), b'hey\n')
-
-            # test fileno
-            log_fileno = os.open(
-                log_file, os.O_CREAT | os.O_TRUNC | os.O_WRONLY)
-            try:
-                code, output = run_and_get_output(
-                    'echo goodbye', log_file=log_fileno)
-                self.assertEqual(code, 0)
-            finally:
-                os.close(log_fileno)
-            self.assertEqual(get_file_content(log_file), b'goodbye\n')
+        finally:
+            os.close(log_fileno)
+        self.assertEqual(get_file_content(log_file), b'goodbye\n')
 
     @slow_test
     def test_kill(self):
-        with TemporaryDirectory() as temp_dir:
-            # test kill by SIGINT
-            host = ProgramHost(
-                [
-                    'python',
-                    '-u', '-c',
-                    'import time, sys\n'
-                    'for i in range(100):\n'
-                    '  sys.stdout.write(str(i) + "\\n")\n'
-                    '  sys.stdout.flush()\n'
-                    '  time.sleep(0.1)\n'
-                ]
-            )
+        temp_dir = str(self.tmp_path_factory.mktemp('program_host'))
+        # test kill by SIGINT
+        host = ProgramHost(
+            [
+                'python',
+                '-u', '-c',
+                'import time, sys\n'
+                'for i in range(100):\n'
+                '  sys.stdout.write(str(i) + "\\n")\n'
+                '  sys.stdout.flush()\n'
+                '  time.sleep(0.1)\n'
+            ]
+        )
+
+        with host.exec_proc() as proc:
+            time.sleep(0.5)
+            start_time = time.time()
+            host.kill(ctrl_c_timeout=0.5)
+            stop_time = time.time()
+
+        host.kill()
+        _ = proc.wait()
+        # self.assertNotEqual(code, 0)
+        self.assertLess(abs(stop_time - start_time), 0.05)
+
+        # test kill by SIGKILL
+        log_file = os.path.join(temp_dir, 'console.log')
+        host = ProgramHost(
+            [
+                'python',
+                '-u', '-c',
+                'import sys, time\n'
+                'while True:\n'
+                '  try:\n'
+                '    time.sleep(0.1)\n'
+                '  except KeyboardInterrupt:\n'
+                '    sys.stdout.write("kbd interrupt\\n")\n'
+                '    sys.stdout.flush()\n'
+            ],
+            log_file=log_file
+        )
+
+        with host.exec_proc() as proc:
+            time.sleep(0.5)
+            start_time = time.time()
+            host.kill(ctrl_c_timeout=0.5)
+            stop_time = time.time()
+
+        host.kill()
+        _ = proc.wait()
+        self.assertEqual(get_file_content(log_file), b'kbd interrupt\n')
+        self.assertLess(abs(stop_time - start_time - 0.5), 0.1)
 
-            with host.exec_proc() as proc:
-                time.sleep(0.5)
-                start_time = time.time()
-                host.kill(ctrl_c_timeout=0.5)
-                stop_time = time.time()
-
-            host.kill()
-            _ = proc.wait()
-            # self.assertNotEqual(code, 0)
-            self.assertLess(abs(stop_time - start_time), 0.05)
-
-            # test kill by SIGKILL
-            log_file = os.path.join(temp_dir, 'console.log')
-            host = ProgramHost(
-                [
-                    'python',
-                    '-u', '-c',
-                    'import sys, time\n'
-                    'while True:\n'
-                    '  try:\n'
-                    '    time.sleep(0.1)\n'
-                    '  except KeyboardInterrupt:\n'
-                    '    sys.stdout.write("kbd interrupt\\n")\n'
-                    '    sys.stdout.flush()\n'
-                ],
-                log_file=log_file
-            )
 
-            with host.exec_proc() as proc:
-                time.sleep(0.5)
-                start_time = time.time()
-                host.kill(ctrl_c_timeout=0.5)
-                stop_time = time.time()
+def _flatten_snapshot(snapshot, prefix=''):
+    # flatten a nested snapshot dict into {arcname: content}
+    ret = {}
+    for name, value in snapshot.items():
+        path = f'{prefix}{name}'
+        if isinstance(value, dict):
+            ret.update(_flatten_snapshot(value, path + '/'))
+        else:
+            ret[path] = value
+    return ret
 
-            host.kill()
-            _ = proc.wait()
-            self.assertEqual(get_file_content(log_file), b'kbd interrupt\n')
-            self.assertLess(abs(stop_time - start_time - 0.5), 0.1)
+
+def _canonical_dumps(snapshot):
+    # serialize a snapshot with sorted dict keys, so that two equal
+    # snapshots always produce identical bytes
+    def canonize(value):
+        if isinstance(value, dict):
+            return [(key, canonize(value[key])) for key in sorted(value)]
+        return value
+    return pickle.dumps(canonize(snapshot), protocol=pickle.HIGHEST_PROTOCOL)
 
 
 class SourceCopierTestCase(unittest.TestCase):
 
+    @pytest.fixture(autouse=True)
+    def _tmp_path_factory(self, tmp_path_factory):
+        self.tmp_path_factory = tmp_path_factory
+
+    def assert_snapshot_equal(self, actual, expected):
+        # the success path is one bytes comparison of the canonical
+        # serializations; fall back to assertDictEqual only on mismatch,
+        # to produce a readable diff
+        if _canonical_dumps(actual) != _canonical_dumps(expected):
+            self.assertDictEqual(actual, expected)
+
     def test_copier(self):
         includes = MLRunnerConfig.source.includes
         excludes = MLRunnerConfig.source.excludes
 
-        with TemporaryDirectory() as temp_dir:
-            # prepare for the source dir
-            source_dir = os.path.join(temp_dir, 'src')
-            prepare_dir(source_dir, {
-                'a.py': b'a.py',
-                'b.txt': b'b.txt',
-                '.git': {
-                    'c.py': b'c.py',
-                },
-                'dir': {
-                    'd.sh': b'd.sh',
-                },
-                'dir2': {
-                    'nested': {
-                        'e.sh': b'e.sh'
-                    },
-                    'f.sh': b'f.sh',
-                },
-                'override.py': b'source'
-            })
-
-            # test copy source
-            dest_dir = os.path.join(temp_dir, 'dst')
-            prepare_dir(dest_dir, {'override.py': b'dest'})
-
-            copier = SourceCopier(source_dir, dest_dir, includes, excludes)
-            copier.clone_dir()
-            self.assertEqual(copier.file_count, 4)
-            dest_content = dir_snapshot(dest_dir)
-            dest_expected = {
-                'a.py': b'a.py',
-                'dir': {
-                    'd.sh': b'd.sh',
+        temp_dir = str(self.tmp_path_factory.mktemp('copier'))
+        # prepare for the source dir
+        source_dir = os.path.join(temp_dir, 'src')
+        prepare_dir(source_dir, {
+            'a.py': b'a.py',
+            'b.txt': b'b.txt',
+            '.git': {
+                'c.py': b'c.py',
+            },
+            'dir': {
+                'd.sh': b'd.sh',
+            },
+            'dir2': {
+                'nested': {
+                    'e.sh': b'e.sh'
                 },
-                'dir2': {
-                    'nested': {
-                        'e.sh': b'e.sh'
-                    },
-                    'f.sh': b'f.sh',
+                'f.sh': b'f.sh',
+            },
+            'override.py': b'source'
+        })
+
+        # test copy source
+        dest_dir = os.path.join(temp_dir, 'dst')
+        prepare_dir(dest_dir, {'override.py': b'dest'})
+
+        copier = SourceCopier(source_dir, dest_dir, includes, excludes)
+        copier.clone_dir()
+        self.assertEqual(copier.file_count, 4)
+        dest_content = dir_snapshot(dest_dir)
+        dest_expected = {
+            'a.py': b'a.py',
+            'dir': {
+                'd.sh': b'd.sh',
+            },
+            'dir2': {
+                'nested': {
+                    'e.sh': b'e.sh'
                 },
-                'override.py': b'dest'
+                'f.sh': b'f.sh',
+            },
+            'override.py': b'dest'
+        }
+        self.assert_snapshot_equal(dest_content, dest_expected)
+
+        # test pack zip: compare each entry's recorded CRC and size
+        # against the expected content, so nothing needs decompressing
+        import zipfile
+        import zlib
+
+        zip_file = os.path.join(temp_dir, 'source.zip')
+        copier.pack_zip(zip_file)
+        dest_expected['override.py'] = b'source'
+        expected_flat = _flatten_snapshot(dest_expected)
+        with zipfile.ZipFile(zip_file, 'r') as zf:
+            zip_entries = {
+                i.filename: (i.CRC, i.file_size)
+                for i in zf.infolist()
+                if not i.filename.endswith('/')
             }
-            self.assertDictEqual(dest_content, dest_expected)
-
-            # test pack zip
-            zip_file = os.path.join(temp_dir, 'source.zip')
-            copier.pack_zip(zip_file)
-            zip_content = zip_snapshot(zip_file)
-            dest_expected['override.py'] = b'source'
-            self.assertDictEqual(zip_content, dest_expected)
-
-            # test cleanup
-            write_file_content(
-                os.path.join(dest_dir, 'dir/more.txt'),
-                b'more.txt')  # more file
-            os.remove(os.path.join(dest_dir, 'dir2/f.sh'))  # fewer file
-            copier.cleanup_dir()
-            dest_content = dir_snapshot(dest_dir)
-            self.assertDictEqual(dest_content, {
-                'dir': {
-                    'more.txt': b'more.txt'
-                },
-                'override.py': b'dest'
-            })
+        assert zip_entries == {
+            name: (zlib.crc32(cnt), len(cnt))
+            for name, cnt in expected_flat.items()
+        }
+
+        # test cleanup
+        write_file_content(
+            os.path.join(dest_dir, 'dir/more.txt'),
+            b'more.txt')  # more file
+        os.remove(os.path.join(dest_dir, 'dir2/f.sh'))  # fewer file
+        copier.cleanup_dir()
+        dest_content = dir_snapshot(dest_dir)
+        self.assert_snapshot_equal(dest_content, {
+            'dir': {
+                'more.txt': b'more.txt'
+            },
+            'override.py': b'dest'
+        })
 
     def test_copy_args_files(self):
-        with TemporaryDirectory() as temp_dir:
-            src = os.path.join(temp_dir, 'src')
-            dst1 = os.path.join(temp_dir, 'dst1')
-            dst2 = os.path.join(temp_dir, 'dst2')
-            prepare_dir(temp_dir, {'e.sh': b'e.sh'})
-
-            # prepare for the source dir
-            prepare_dir(src, {
-                'a.py': b'a.py',
-                'a.sh': b'a.sh',
-                'a.txt': b'a.txt',
-                'nested': {
-                    'b.sh': b'b.sh',
-                    'b.py': b'b.py',
-                },
-                '.git': {
-                    'c.py': b'c.py'
-                },
-            })
-
-            # test copy according to command line
-            copier = SourceCopier(src, dst1, MLRunnerConfig.source.includes,
-                                  MLRunnerConfig.source.excludes)
-            copier.copy_args_files(
-                'python a.py a.txt nested/b.py ./nested/../nested/b.sh '
-                '.git/c.py d.sh ../e.sh'
-            )
-            self.assertDictEqual(dir_snapshot(dst1), {
-                'a.py': b'a.py',
-                'nested': {
-                    'b.sh': b'b.sh',
-                    'b.py': b'b.py',
-                }
-            })
-
-            # test copy according to args
-            copier = SourceCopier(src, dst2, MLRunnerConfig.source.includes,
-                                  MLRunnerConfig.source.excludes)
-            copier.copy_args_files(
-                'python a.py a.txt nested/b.py ./nested/../nested/b.sh '
-                '.git/c.py d.sh ../e.sh'.split(' ')
-            )
-            self.assertDictEqual(dir_snapshot(dst2), {
-                'a.py': b'a.py',
-                'nested': {
-                    'b.sh': b'b.sh',
-                    'b.py': b'b.py',
-                }
-            })
+        temp_dir = str(self.tmp_path_factory.mktemp('copier'))
+        src = os.path.join(temp_dir, 'src')
+        dst1 = os.path.join(temp_dir, 'dst1')
+        dst2 = os.path.join(temp_dir, 'dst2')
+        prepare_dir(temp_dir, {'e.sh': b'e.sh'})
+
+        # prepare for the source dir
+        prepare_dir(src, {
+            'a.py': b'a.py',
+            'a.sh': b'a.sh',
+            'a.txt': b'a.txt',
+            'nested': {
+                'b.sh': b'b.sh',
+                'b.py': b'b.py',
+            },
+            '.git': {
+                'c.py': b'c.py'
+            },
+        })
+
+        # test copy according to command line
+        copier = SourceCopier(src, dst1, MLRunnerConfig.source.includes,
+                              MLRunnerConfig.source.excludes)
+        copier.copy_args_files(
+            'python a.py a.txt nested/b.py ./nested/../nested/b.sh '
+            '.git/c.py d.sh ../e.sh'
+        )
+        self.assert_snapshot_equal(dir_snapshot(dst1), {
+            'a.py': b'a.py',
+            'nested': {
+                'b.sh': b'b.sh',
+                'b.py': b'b.py',
+            }
+        })
+
+        # test copy according to args
+        copier = SourceCopier(src, dst2, MLRunnerConfig.source.includes,
+                              MLRunnerConfig.source.excludes)
+        copier.copy_args_files(
+            'python a.py a.txt nested/b.py ./nested/../nested/b.sh '
+            '.git/c.py d.sh ../e.sh'.split(' ')
+        )
+        self.assert_snapshot_equal(dir_snapshot(dst2), {
+            'a.py': b'a.py',
+            'nested': {
+                'b.sh': b'b.sh',
+                'b.py': b'b.py',
+            }
+        })
 
 
 class TemporaryFileCleanerTestCase(unittest.TestCase):
 
+    @pytest.fixture(autouse=True)
+    def _tmp_path_factory(self, tmp_path_factory):
+        self.tmp_path_factory = tmp_path_factory
+
     maxDiff = None
 
     def test_cleanup(self):
-        with TemporaryDirectory() as temp_dir:
-            prepare_dir(temp_dir, {
-                '.git': {
-                    'a.pyc': b'a.pyc'
-                },
+        temp_dir = str(self.tmp_path_factory.mktemp('cleaner'))
+        prepare_dir(temp_dir, {
+            '.git': {
+                'a.pyc': b'a.pyc'
+            },
+            '__pycache__': {
+                'b.pyc': b'b.pyc',
+                'g.txt': b'g.txt',
+            },
+            'nested': {
                 '__pycache__': {
-                    'b.pyc': b'b.pyc',
-                    'g.txt': b'g.txt',
-                },
-                'nested': {
-                    '__pycache__': {
-                        'c.pyc': b'c.pyc',
-                        'd.pyc': b'd.pyc',
-                        'Thumbs.db': b'Thumbs.db',
-                        '.DS_Store': b'.DS_Store',
-                    },
-                    'e.pyc': b'e.pyc',
+                    'c.pyc': b'c.pyc',
+                    'd.pyc': b'd.pyc',
+                    'Thumbs.db': b'Thumbs.db',
+                    '.DS_Store': b'.DS_Store',
                 },
-                'h.DS_Store': b'h.DS_Store'
-            })
+                'e.pyc': b'e.pyc',
+            },
+            'h.DS_Store': b'h.DS_Store'
+        })
 
-            cleaner = TemporaryFileCleaner(temp_dir)
-            cleaner.cleanup()
+        cleaner = TemporaryFileCleaner(temp_dir)
+        cleaner.cleanup()
 
-            self.assertDictEqual(dir_snapshot(temp_dir), {
-                '.git': {
-                    'a.pyc': b'a.pyc',
-                },
-                '__pycache__': {
-                    'g.txt': b'g.txt',
-                },
-                'nested': {},
-                'h.DS_Store': b'h.DS_Store'
-            })
+        self.assertDictEqual(dir_snapshot(temp_dir), {
+            '.git': {
+                'a.pyc': b'a.pyc',
+            },
+            '__pycache__': {
+                'g.txt': b'g.txt',
+            },
+            'nested': {},
+            'h.DS_Store': b'h.DS_Store'
+        })
 
-            # test cleanup non-exist directory
-            cleaner = TemporaryFileCleaner(os.path.join(temp_dir, 'non-exist'))
-            cleaner.cleanup()
+        # test cleanup non-exist directory
+        cleaner = TemporaryFileCleaner(os.path.join(temp_dir, 'non-exist'))
+        cleaner.cleanup()
 
 
 class JsonFileWatcherTestCase(unittest.TestCase):
 
+    @pytest.fixture(autouse=True)
+    def _tmp_path_factory(self, tmp_path_factory):
+        self.tmp_path_factory = tmp_path_factory
+
     @slow_test
     def test_watcher(self):
-        with TemporaryDirectory() as temp_dir:
-            logs = []
-            path_a = os.path.join(temp_dir, 'a.json')
-            path_b = os.path.join(temp_dir, 'b.json')
-            path_c = os.path.join(temp_dir, 'c.json')
-            os.makedirs(os.path.join(temp_dir, 'd.json'))
-
-            watcher = JsonFileWatcher(
-                root_dir=temp_dir,
-                file_names=['a.json', 'b.json', 'd.json'],
-                interval=0.1,
-            )
+        temp_dir = str(self.tmp_path_factory.mktemp('watcher'))
+        logs = []
+        path_a = os.path.join(temp_dir, 'a.json')
+        path_b = os.path.join(temp_dir, 'b.json')
+        path_c = os.path.join(temp_dir, 'c.json')
+        os.makedirs(os.path.join(temp_dir, 'd.json'))
+
+        watcher = JsonFileWatcher(
+            root_dir=temp_dir,
+            file_names=['a.json', 'b.json', 'd.json'],
+            interval=0.1,
+        )
 
-            def on_json_updated(*args):
-                logs.append(args)
-
-            def raise_error(*args):
-                raise RuntimeError('raised error')
-
-            watcher.on_json_updated.do(on_json_updated)
-            watcher.on_json_updated.do(raise_error)
-
-            with watcher:
-                write_file_content(path_a, b'{"a": 1}')
-                write_file_content(path_c, b'{"c": 3}')
-                time.sleep(0.12)
-                write_file_content(path_b, b'{"b": 2}')
-                time.sleep(0.12)
-                self.assertListEqual(logs, [
-                    ('a.json', {'a': 1}), ('b.json', {'b': 2})
-                ])
-
-                write_file_content(path_a, b'{"a": 4}')
-                time.sleep(0.12)
-                self.assertListEqual(logs, [
-                    ('a.json', {'a': 1}), ('b.json', {'b': 2}),
-                    ('a.json', {'a': 4})
-                ])
-
-            self.assertListEqual(logs, [
+        def on_json_updated(*args):
+            logs.append(args)
+
+        def raise_error(*args):
+            raise RuntimeError('raised error')
+
+        watcher.on_json_updated.do(on_json_updated)
+        watcher.on_json_updated.do(raise_error)
+
+        with watcher:
+            write_file_content(path_a, b'{"a": 1}')
+            write_file_content(path_c, b'{"c": 3}')
+            time.sleep(0.12)
+            write_file_content(path_b, b'{"b": 2}')
+            time.sleep(0.12)
+            assert logs == [
+                ('a.json', {'a': 1}), ('b.json', {'b': 2})
+            ]
+
+            write_file_content(path_a, b'{"a": 4}')
+            time.sleep(0.12)
+            assert logs == [
                 ('a.json', {'a': 1}), ('b.json', {'b': 2}),
-                ('a.json', {'a': 4}),
-                # the forced, final check
-                ('a.json', {'a': 4}), ('b.json', {'b': 2})
-            ])
+                ('a.json', {'a': 4})
+            ]
+
+        assert logs == [
+            ('a.json', {'a': 1}), ('b.json', {'b': 2}),
+            ('a.json', {'a': 4}),
+            # the forced, final check
+            ('a.json', {'a': 4}), ('b.json', {'b': 2})
+        ]
 
 
 class ControlPortServerTestCase(unittest.TestCase):
@@ -1310,13 +1404,13 @@ class ControlPortServerTestCase(unittest.TestCase):
 
             # test kill
             server.on_kill.do(lambda: logs.append('on kill'))
-            self.assertListEqual(logs, [])
+            assert logs == []
             r = requests.post(server.uri + '/kill', json={})
             self.assertEqual(r.status_code, 200)
             self.assertEqual(r.content, b'{}')
             self.assertEqual(r.headers['Content-Type'].split(';', 1)[0],
                              'application/json')
-            self.assertListEqual(logs, ['on kill'])
+            assert logs == ['on kill']
 
             # test kill but error
             def on_kill_error():
@@ -106,6 +106,27 @@ class ProgramOutputReceiverTestCase(unittest.TestCase):
             receiver.stop()
         self.assertListEqual(logs, [b'final'])
 
+    def test_large_buffer(self):
+        # pin the line-splitting complexity: a 1MB buffer with 200k lines
+        # must be split by the C-level regex scan in one pass; a
+        # byte-at-a-time Python loop would time out here
+        class MyParser(ProgramOutputParser):
+            def parse_line(self, line: bytes):
+                logs.append(line)
+                return ()
+
+        logs = []
+        n_lines = 200000
+        receiver = ProgramOutputReceiver([MyParser()],
+                                         read_line_timeout=None)
+        receiver.start()
+        try:
+            receiver.put_output(b'line\n' * n_lines)
+        finally:
+            receiver.stop()
+        assert len(logs) == n_lines
+        assert set(logs) == {b'line'}
+
     def test_on_program_info(self):
         @dataclass
         class MyInfo(ProgramInfo):